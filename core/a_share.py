@@ -38,6 +38,21 @@ def fetch_a_share_financials(symbol_cn: str) -> AShareFinancials:
     return AShareFinancials(profit=profit, balance=balance, cash=cash)
 
 
+# 东方财富个股信息（stock_individual_info_em）里行业字段的候选名，按优先级排列
+INDUSTRY_KEYS = ("所属行业", "行业", "所属板块", "行业分类")
+
+
+# json.dumps 带非默认参数时每次调用都会新建 JSONEncoder；逐行序列化复用同一个实例
+_PAYLOAD_ENCODER = json.JSONEncoder(ensure_ascii=False, default=str)
+
+
 def row_payload(row: pd.Series, keep_cols: list[str]) -> str:
     payload = {k: (None if pd.isna(row.get(k)) else row.get(k)) for k in keep_cols if k in row.index}
-    return json.dumps(payload, ensure_ascii=False, default=str)
+    return _PAYLOAD_ENCODER.encode(payload)
+
+
+def frame_payloads(df: pd.DataFrame, keep_cols: list[str]) -> list[str]:
+    """整表版 row_payload：按列取值一次，逐行序列化，不经 iterrows 构造 Series。"""
+    cols = [c for c in dict.fromkeys(keep_cols) if c in df.columns]
+    encode = _PAYLOAD_ENCODER.encode
+    return [encode({k: (None if pd.isna(v) else v) for k, v in rec.items()}) for rec in df[cols].to_dict("records")]
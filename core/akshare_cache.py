@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import time
+from functools import wraps
+from pathlib import Path
+
+from core.db import get_app_data_dir
+
+
+def _ttl_seconds(ttl_days: float | None) -> float:
+    # AKSHARE_CACHE_TTL_DAYS 只作为未显式指定有效期时的默认值（默认 1 天）；设为 0 则整体关闭磁盘缓存。
+    # 调用方显式传入的 ttl_days（如行业信息 7 天）不会被它改短或改长
+    raw = (os.environ.get("AKSHARE_CACHE_TTL_DAYS") or "").strip()
+    try:
+        env_days = float(raw) if raw else None
+    except Exception:
+        env_days = None
+    if env_days is not None and env_days <= 0:
+        return 0.0
+    if ttl_days is None:
+        ttl_days = env_days if env_days is not None else 1.0
+    return max(0.0, float(ttl_days)) * 86400
+
+
+def _cache_path(fn_name: str, kwargs: dict) -> Path:
+    key = repr((fn_name, sorted(kwargs.items())))
+    h = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    d = get_app_data_dir() / "akshare_cache"
+    d.mkdir(parents=True, exist_ok=True)
+    return d / f"{h}.pkl"
+
+
+def cached(fn, *, ttl_days: float | None = None):
+    """给 AkShare 接口加磁盘缓存：按 (函数名, 关键字参数) 取键，文件 mtime 超过有效期即重新拉取。
+
+    只缓存非空结果；接口抛异常或返回空表时不落盘，下次照常请求。过期文件在读取时删除。
+    """
+    fn_name = getattr(fn, "__name__", repr(fn))
+
+    @wraps(fn)
+    def wrapper(**kwargs):
+        ttl = _ttl_seconds(ttl_days)
+        fp = None
+        if ttl > 0:
+            try:
+                fp = _cache_path(fn_name, kwargs)
+                if (time.time() - fp.stat().st_mtime) < ttl:
+                    with fp.open("rb") as f:
+                        return pickle.load(f)
+                # 已过期：先删掉，本次拉取失败或结果为空时也不会留着旧文件
+                fp.unlink(missing_ok=True)
+            except Exception:
+                pass
+
+        result = fn(**kwargs)
+
+        if fp is not None and result is not None and not getattr(result, "empty", False):
+            try:
+                # 先写临时文件再原子替换，并发请求不会读到半截内容
+                tmp = fp.with_name(f"{fp.name}.{os.getpid()}.{id(result)}.tmp")
+                with tmp.open("wb") as f:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, fp)
+            except Exception:
+                pass
+        return result
+
+    return wrapper
@@ -9,6 +9,7 @@ import streamlit as st
 from dataclasses import dataclass
 from typing import Optional
 
+from core.a_share import INDUSTRY_KEYS as _INDUSTRY_KEYS
 from core.net import disable_proxies_for_process
 
 
@@ -64,6 +65,62 @@ def _set_error_detail(data: FinancialData, detail: str) -> None:
         pass
 
 
+# A 股报表/指标中文字段名（多个候选名时按优先级排列）
+_K_STOCK_NAME = "股票简称"
+_K_PERIOD = "报告期"
+_K_REPORT_DATE = "报告日"
+_K_TOTAL_REVENUE = "营业总收入"
+_K_NET_PROFIT = "净利润"
+_K_TOTAL_ASSETS = "总资产"
+_EQUITY_KEYS = ("净资产", "股东权益")
+_K_ROE = "净资产收益率(%)"
+_ROA_KEYS = ("总资产报酬率(%)", "总资产净利率(%)")
+_K_GROSS_MARGIN = "销售毛利率(%)"
+_K_NET_MARGIN = "销售净利率(%)"
+_K_CURRENT_RATIO = "流动比率"
+_K_QUICK_RATIO = "速动比率"
+_K_DEBT_RATIO = "资产负债率(%)"
+_SINA_REVENUE_KEYS = ("营业收入", "营业总收入")
+_SINA_NET_PROFIT_KEYS = ("净利润", "归属于母公司所有者的净利润")
+_SINA_TOTAL_ASSETS_KEYS = ("资产总计", "总资产")
+_SINA_EQUITY_KEYS = ("股东权益合计", "归属于母公司股东权益合计", "净资产")
+_SINA_LIABILITIES_KEYS = ("负债合计", "总负债")
+
+
+def _first(row, keys: tuple[str, ...]):
+    """等价于 row.get(k1) or row.get(k2) or ..."""
+    v = None
+    for k in keys:
+        v = row.get(k)
+        if v:
+            return v
+    return v
+
+
+# 千分位逗号与各类空白一次性剔除（str.translate 单次 C 级遍历）
+_AMOUNT_STRIP_TABLE = str.maketrans("", "", ", \t\n\r\u3000\xa0")
+
+
+def _to_amount(v) -> float | None:
+    """金额（元，可带 亿/万 后缀）转换为 亿元"""
+    try:
+        if v is None:
+            return None
+        sv = str(v).translate(_AMOUNT_STRIP_TABLE)
+        if sv in ("", "--", "nan", "None"):
+            return None
+        mult = 1.0
+        if sv.endswith("亿"):
+            mult = 1e8
+            sv = sv[:-1]
+        elif sv.endswith("万"):
+            mult = 1e4
+            sv = sv[:-1]
+        return float(sv) * mult / 1e8
+    except Exception:
+        return None
+
+
 def _has_meaningful_financials(data: FinancialData) -> bool:
     return any(
         v is not None
@@ -602,14 +659,9 @@ def fetch_cn_financials(symbol: str) -> Optional[FinancialData]:
             stock_info = ak.stock_individual_info_em(symbol=code)
             if stock_info is not None and not stock_info.empty:
                 info_dict = dict(zip(stock_info['item'], stock_info['value']))
-                data.company_name = info_dict.get('股票简称', code)
+                data.company_name = info_dict.get(_K_STOCK_NAME, code)
                 try:
-                    data.industry = (
-                        info_dict.get('所属行业')
-                        or info_dict.get('行业')
-                        or info_dict.get('所属板块')
-                        or info_dict.get('行业分类')
-                    )
+                    data.industry = _first(info_dict, _INDUSTRY_KEYS)
                 except Exception:
                     pass
         except Exception:
@@ -621,26 +673,26 @@ def fetch_cn_financials(symbol: str) -> Optional[FinancialData]:
             finance_df = ak.stock_financial_abstract_ths(symbol=code, indicator="按报告期")
             if finance_df is not None and not finance_df.empty:
                 latest = finance_df.iloc[0]
-                data.period = str(latest.get('报告期', ''))
+                data.period = str(latest.get(_K_PERIOD, ''))
                 
                 # 尝试获取各项指标
-                if '营业总收入' in latest:
-                    val = latest['营业总收入']
+                if _K_TOTAL_REVENUE in latest:
+                    val = latest[_K_TOTAL_REVENUE]
                     if val and str(val) != '--':
                         data.revenue = float(str(val).replace(',', '')) / 1e8
                 
-                if '净利润' in latest:
-                    val = latest['净利润']
+                if _K_NET_PROFIT in latest:
+                    val = latest[_K_NET_PROFIT]
                     if val and str(val) != '--':
                         data.net_profit = float(str(val).replace(',', '')) / 1e8
                 
-                if '总资产' in latest:
-                    val = latest['总资产']
+                if _K_TOTAL_ASSETS in latest:
+                    val = latest[_K_TOTAL_ASSETS]
                     if val and str(val) != '--':
                         data.total_assets = float(str(val).replace(',', '')) / 1e8
                 
-                if '净资产' in latest or '股东权益' in latest:
-                    val = latest.get('净资产') or latest.get('股东权益')
+                if any(k in latest for k in _EQUITY_KEYS):
+                    val = _first(latest, _EQUITY_KEYS)
                     if val and str(val) != '--':
                         data.total_equity = float(str(val).replace(',', '')) / 1e8
         except Exception as e:
@@ -653,38 +705,38 @@ def fetch_cn_financials(symbol: str) -> Optional[FinancialData]:
             if ratio_df is not None and not ratio_df.empty:
                 latest = ratio_df.iloc[0]
                 
-                if '净资产收益率(%)' in latest:
-                    val = latest['净资产收益率(%)']
+                if _K_ROE in latest:
+                    val = latest[_K_ROE]
                     if val and str(val) != '--':
                         data.roe = float(val)
                 
-                if '总资产报酬率(%)' in latest or '总资产净利率(%)' in latest:
-                    val = latest.get('总资产报酬率(%)') or latest.get('总资产净利率(%)')
+                if any(k in latest for k in _ROA_KEYS):
+                    val = _first(latest, _ROA_KEYS)
                     if val and str(val) != '--':
                         data.roa = float(val)
                 
-                if '销售毛利率(%)' in latest:
-                    val = latest['销售毛利率(%)']
+                if _K_GROSS_MARGIN in latest:
+                    val = latest[_K_GROSS_MARGIN]
                     if val and str(val) != '--':
                         data.gross_margin = float(val)
                 
-                if '销售净利率(%)' in latest:
-                    val = latest['销售净利率(%)']
+                if _K_NET_MARGIN in latest:
+                    val = latest[_K_NET_MARGIN]
                     if val and str(val) != '--':
                         data.net_margin = float(val)
                 
-                if '流动比率' in latest:
-                    val = latest['流动比率']
+                if _K_CURRENT_RATIO in latest:
+                    val = latest[_K_CURRENT_RATIO]
                     if val and str(val) != '--':
                         data.current_ratio = float(val)
                 
-                if '速动比率' in latest:
-                    val = latest['速动比率']
+                if _K_QUICK_RATIO in latest:
+                    val = latest[_K_QUICK_RATIO]
                     if val and str(val) != '--':
                         data.quick_ratio = float(val)
                 
-                if '资产负债率(%)' in latest:
-                    val = latest['资产负债率(%)']
+                if _K_DEBT_RATIO in latest:
+                    val = latest[_K_DEBT_RATIO]
                     if val and str(val) != '--':
                         data.debt_ratio = float(val)
         except Exception as e:
@@ -720,35 +772,24 @@ def fetch_cn_financials(symbol: str) -> Optional[FinancialData]:
 
             try:
                 if prow is not None and data.period == "":
-                    data.period = str(prow.get("报告日") or "")
+                    data.period = str(prow.get(_K_REPORT_DATE) or "")
             except Exception:
                 pass
 
-            def _to_amount(v):
-                try:
-                    if v is None:
-                        return None
-                    sv = str(v).replace(",", "").strip()
-                    if sv in ("", "--", "nan", "None"):
-                        return None
-                    return float(sv) / 1e8
-                except Exception:
-                    return None
-
             try:
                 if prow is not None:
-                    data.revenue = _to_amount(prow.get("营业收入") or prow.get("营业总收入"))
-                    data.net_profit = _to_amount(prow.get("净利润") or prow.get("归属于母公司所有者的净利润"))
+                    data.revenue = _to_amount(_first(prow, _SINA_REVENUE_KEYS))
+                    data.net_profit = _to_amount(_first(prow, _SINA_NET_PROFIT_KEYS))
                     data.gross_margin = None
-                    data.net_margin = _to_amount(prow.get("销售净利率(%)"))
+                    data.net_margin = _to_amount(prow.get(_K_NET_MARGIN))
             except Exception:
                 pass
 
             try:
                 if brow is not None:
-                    data.total_assets = _to_amount(brow.get("资产总计") or brow.get("总资产"))
-                    data.total_equity = _to_amount(brow.get("股东权益合计") or brow.get("归属于母公司股东权益合计") or brow.get("净资产"))
-                    data.total_liabilities = _to_amount(brow.get("负债合计") or brow.get("总负债"))
+                    data.total_assets = _to_amount(_first(brow, _SINA_TOTAL_ASSETS_KEYS))
+                    data.total_equity = _to_amount(_first(brow, _SINA_EQUITY_KEYS))
+                    data.total_liabilities = _to_amount(_first(brow, _SINA_LIABILITIES_KEYS))
             except Exception:
                 pass
 
@@ -797,59 +838,80 @@ def fetch_financials(symbol: str, market: str) -> Optional[FinancialData]:
         return None
 
 
+_METRIC_CODES = (
+    "GROSS_MARGIN",
+    "NET_MARGIN",
+    "ROE",
+    "ROA",
+    "CURRENT_RATIO",
+    "QUICK_RATIO",
+    "DEBT_ASSET",
+    "EQUITY_RATIO",
+    "ASSET_TURNOVER",
+    "INVENTORY_TURNOVER",
+    "RECEIVABLE_TURNOVER",
+)
+
+
 def compute_metrics_from_financial_data(data: FinancialData) -> dict:
     """从财务数据计算指标"""
-    metrics = {}
-    
+    revenue = data.revenue
+    net_profit = data.net_profit
+    total_assets = data.total_assets
+    total_equity = data.total_equity
+    total_liabilities = data.total_liabilities
+    current_assets = data.current_assets
+    current_liabilities = data.current_liabilities
+    inventory = data.inventory
+    receivables = data.receivables
+
     # 盈利能力
-    if data.gross_margin is not None:
-        metrics["GROSS_MARGIN"] = data.gross_margin
-    elif data.revenue and data.gross_profit and data.revenue > 0:
-        metrics["GROSS_MARGIN"] = (data.gross_profit / data.revenue) * 100
-    
-    if data.net_margin is not None:
-        metrics["NET_MARGIN"] = data.net_margin
-    elif data.revenue and data.net_profit and data.revenue > 0:
-        metrics["NET_MARGIN"] = (data.net_profit / data.revenue) * 100
-    
-    if data.roe is not None:
-        metrics["ROE"] = data.roe
-    elif data.net_profit and data.total_equity and data.total_equity > 0:
-        metrics["ROE"] = (data.net_profit / data.total_equity) * 100
-    
-    if data.roa is not None:
-        metrics["ROA"] = data.roa
-    elif data.net_profit and data.total_assets and data.total_assets > 0:
-        metrics["ROA"] = (data.net_profit / data.total_assets) * 100
-    
+    gm = data.gross_margin
+    if gm is None and revenue and data.gross_profit and revenue > 0:
+        gm = (data.gross_profit / revenue) * 100
+
+    nm = data.net_margin
+    if nm is None and revenue and net_profit and revenue > 0:
+        nm = (net_profit / revenue) * 100
+
+    roe = data.roe
+    if roe is None and net_profit and total_equity and total_equity > 0:
+        roe = (net_profit / total_equity) * 100
+
+    roa = data.roa
+    if roa is None and net_profit and total_assets and total_assets > 0:
+        roa = (net_profit / total_assets) * 100
+
     # 偿债能力
-    if data.current_ratio is not None:
-        metrics["CURRENT_RATIO"] = data.current_ratio
-    elif data.current_assets and data.current_liabilities and data.current_liabilities > 0:
-        metrics["CURRENT_RATIO"] = data.current_assets / data.current_liabilities
-    
-    if data.quick_ratio is not None:
-        metrics["QUICK_RATIO"] = data.quick_ratio
-    elif data.current_assets and data.inventory and data.current_liabilities and data.current_liabilities > 0:
-        metrics["QUICK_RATIO"] = (data.current_assets - data.inventory) / data.current_liabilities
-    
-    if data.debt_ratio is not None:
-        metrics["DEBT_ASSET"] = data.debt_ratio
-    elif data.total_liabilities and data.total_assets and data.total_assets > 0:
-        metrics["DEBT_ASSET"] = (data.total_liabilities / data.total_assets) * 100
-    
+    cr = data.current_ratio
+    if cr is None and current_assets and current_liabilities and current_liabilities > 0:
+        cr = current_assets / current_liabilities
+
+    qr = data.quick_ratio
+    if qr is None and current_assets and inventory and current_liabilities and current_liabilities > 0:
+        qr = (current_assets - inventory) / current_liabilities
+
+    da = data.debt_ratio
+    if da is None and total_liabilities and total_assets and total_assets > 0:
+        da = (total_liabilities / total_assets) * 100
+
     # 产权比率
-    if data.total_liabilities and data.total_equity and data.total_equity > 0:
-        metrics["EQUITY_RATIO"] = data.total_liabilities / data.total_equity
-    
+    er = None
+    if total_liabilities and total_equity and total_equity > 0:
+        er = total_liabilities / total_equity
+
     # 营运能力
-    if data.revenue and data.total_assets and data.total_assets > 0:
-        metrics["ASSET_TURNOVER"] = data.revenue / data.total_assets
-    
-    if data.revenue and data.inventory and data.inventory > 0:
-        metrics["INVENTORY_TURNOVER"] = data.revenue / data.inventory
-    
-    if data.revenue and data.receivables and data.receivables > 0:
-        metrics["RECEIVABLE_TURNOVER"] = data.revenue / data.receivables
-    
-    return metrics
+    at = it = rt = None
+    if revenue and total_assets and total_assets > 0:
+        at = revenue / total_assets
+    if revenue and inventory and inventory > 0:
+        it = revenue / inventory
+    if revenue and receivables and receivables > 0:
+        rt = revenue / receivables
+
+    # 一次性构建结果字典，键顺序固定
+    return {
+        k: v
+        for k, v in zip(_METRIC_CODES, (gm, nm, roe, roa, cr, qr, da, er, at, it, rt))
+        if v is not None
+    }
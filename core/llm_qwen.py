@@ -16,6 +16,14 @@ def get_api_key() -> str:
     return os.environ.get("DASHSCOPE_API_KEY", "")
 
 
+def _body_preview(resp: httpx.Response, limit: int = 500) -> str:
+    """错误响应体预览：只解码前 limit 字节，避免整包 bytes→str"""
+    try:
+        return resp.content[:limit].decode("utf-8", "replace")
+    except Exception:
+        return ""
+
+
 def test_qwen_connection(api_key: Optional[str] = None) -> tuple[bool, str]:
     key = api_key or get_api_key()
     if not key:
@@ -41,7 +49,7 @@ def test_qwen_connection(api_key: Optional[str] = None) -> tuple[bool, str]:
             timeout=15.0,
         )
         if resp.status_code >= 400:
-            return False, f"http_{resp.status_code}:{resp.text[:500]}"
+            return False, f"http_{resp.status_code}:{_body_preview(resp)}"
         data = resp.json()
         if (data or {}).get("output"):
             return True, "ok"
@@ -149,11 +157,8 @@ def extract_financials_with_ai(pdf_text: str, api_key: Optional[str] = None, rai
 
     except httpx.HTTPStatusError as e:
         resp = e.response
-        try:
-            body = resp.text
-        except Exception:
-            body = ""
-        print(f"AI extraction HTTP error: {resp.status_code}, body: {body[:500]}")
+        body = _body_preview(resp)
+        print(f"AI extraction HTTP error: {resp.status_code}, body: {body}")
         if raise_on_error:
             raise RuntimeError(f"qwen_http_{resp.status_code}:{body[:300]}")
         return {}
@@ -247,7 +252,7 @@ def merge_ai_extracted_data(extracted: dict, ai_data: dict):
 
     if overridden:
         try:
-            setattr(extracted, "_ai_overrode", overridden)
+            extracted.ai_overrode = tuple(overridden)
         except Exception:
             pass
 
@@ -321,11 +326,8 @@ def analyze_financials_with_qwen(
 
     except httpx.HTTPStatusError as e:
         resp = e.response
-        try:
-            body = resp.text
-        except Exception:
-            body = ""
-        print(f"Qwen API HTTP error: {resp.status_code}, body: {body[:500]}")
+        body = _body_preview(resp)
+        print(f"Qwen API HTTP error: {resp.status_code}, body: {body}")
         return _generate_fallback_analysis(company_name, metrics)
     except Exception as e:
         print(f"Qwen API error: {e}")
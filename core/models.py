@@ -3,7 +3,7 @@ from __future__ import annotations
 import time
 import uuid
 
-from sqlalchemy import Float, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -150,6 +150,9 @@ class Statement(Base):
     raw_payload: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[int] = mapped_column(Integer, default=lambda: int(time.time()))
 
+    # 按报告取期间列表（DISTINCT period_end）可只走索引
+    __table_args__ = (Index("ix_stmt_report_period", "report_id", "period_end"),)
+
     report: Mapped[Report] = relationship("Report", back_populates="statements")
 
 
@@ -173,6 +176,8 @@ class StatementItem(Base):
     original_item_name: Mapped[str | None] = mapped_column(String, nullable=True)
     mapping_confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
 
+    __table_args__ = (Index("ix_stmtitem_report_period", "report_id", "period_end"),)
+
     report: Mapped[Report] = relationship("Report", back_populates="items")
 
 
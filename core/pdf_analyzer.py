@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 from core.pdf_text import extract_pdf_text
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedFinancials:
     """从 PDF 提取的财务数据"""
     # 报告期信息
@@ -34,31 +35,343 @@ class ExtractedFinancials:
     roa_direct: float | None = None
     current_ratio_direct: float | None = None
     debt_ratio_direct: float | None = None
+    # AI 增强诊断信息
+    ai_enhanced: bool = False
+    ai_keys: tuple[str, ...] = ()
+    ai_overrode: tuple[str, ...] = ()  # 被 AI 覆盖的字段（AI 侧字段名）
+
+
+# 全角/康熙部首 → 常用字符映射（单字符互不重叠，替换顺序无关）
+_FULLWIDTH_REPLACEMENTS: tuple[tuple[str, str], ...] = (
+    ('⼊', '入'), ('⼀', '一'), ('⼆', '二'), ('⼗', '十'),
+    ('⽉', '月'), ('⽇', '日'), ('⾏', '行'), ('⾸', '首'), ('⾦', '金'),
+    ('⾼', '高'), ('⽤', '用'), ('⽬', '目'), ('⽣', '生'), ('⽩', '白'),
+    ('⽴', '立'), ('⽹', '网'), ('⾃', '自'), ('⾄', '至'), ('⾊', '色'),
+    ('⾐', '衣'), ('⾒', '见'), ('⾓', '角'), ('⾔', '言'),
+    ('⾕', '谷'), ('⾖', '豆'), ('⾛', '走'), ('⾜', '足'), ('⾝', '身'),
+    ('⻋', '车'), ('⻓', '长'), ('⻔', '门'), ('⻛', '风'), ('⻜', '飞'),
+    ('⻝', '食'), ('⻢', '马'), ('⻥', '鱼'), ('⻦', '鸟'), ('⿊', '黑'),
+    ('％', '%'), ('：', ':'), ('（', '('), ('）', ')'),
+)
 
 
 def _normalize_chinese_text(text: str) -> str:
     """标准化中文文本 - 处理全角字符等"""
-    # 全角转半角映射
-    replacements = {
-        '⼊': '入', '⼀': '一', '⼆': '二', '⼆': '二', '⼗': '十',
-        '⽉': '月', '⽇': '日', '⾏': '行', '⾸': '首', '⾦': '金',
-        '⾼': '高', '⽤': '用', '⽬': '目', '⽣': '生', '⽩': '白',
-        '⽴': '立', '⽹': '网', '⾃': '自', '⾄': '至', '⾊': '色',
-        '⾏': '行', '⾐': '衣', '⾒': '见', '⾓': '角', '⾔': '言',
-        '⾕': '谷', '⾖': '豆', '⾛': '走', '⾜': '足', '⾝': '身',
-        '⻋': '车', '⻓': '长', '⻔': '门', '⻛': '风', '⻜': '飞',
-        '⻝': '食', '⻢': '马', '⻥': '鱼', '⻦': '鸟', '⿊': '黑',
-        '％': '%', '：': ':', '（': '(', '）': ')',
-    }
-    for old, new in replacements.items():
+    # 注意：这里保留逐个 str.replace 而不用 str.translate。
+    # CPython 的 replace 走 C 层快速查找，未命中时直接返回原串不分配；
+    # 而 translate(dict) 对非 ASCII 文本逐字符查字典，实测 80KB 中文文本慢约 10 倍。
+    for old, new in _FULLWIDTH_REPLACEMENTS:
         text = text.replace(old, new)
     return text
 
 
+_I = re.IGNORECASE
+
+# ========== 报告期 ==========
+_MONTH_MAP = {
+    "january": 1,
+    "february": 2,
+    "march": 3,
+    "april": 4,
+    "may": 5,
+    "june": 6,
+    "july": 7,
+    "august": 8,
+    "september": 9,
+    "october": 10,
+    "november": 11,
+    "december": 12,
+}
+
+# "fiscal year ended ..." 的命中必然也是 "year ended ..." 的命中，只需扫描后者
+_RE_YEAR_ENDED = re.compile(r"(?:Year|year)\s+[Ee]nded\s+(\w+)\s+(\d{1,2}),?\s+(\d{4})", _I)
+_RE_AS_OF = re.compile(r"as\s+of\s+(\w+)\s+(\d{1,2}),?\s+(\d{4})", _I)
+_RE_CN_QUARTERLY = re.compile(r"(\d{4})年第?[三3]季度报告")
+_RE_CN_DATE = re.compile(r"(\d{4})\s*年\s*(\d{1,2})\s*月\s*(\d{1,2})\s*日")
+_RE_CN_ANNUAL = re.compile(r"(\d{4})\s*(?:度|年度)")
+_RE_QUARTERLY = re.compile(r"(?:Third|3rd|Q3)\s*(?:Quarterly\s*Report)?\s*(\d{4})", _I)
+_RE_ANNUAL = re.compile(r"(\d{4})\s*(?:Annual\s+Report|年度报告|年报)", _I)
+
+# 以 4 位年份开头的四种格式合并为一个交替式：只扫描一遍全文定位候选起点，
+# 再在这些起点上逐格式 match（单一交替式在 re 中会互相遮蔽，不能直接取 lastgroup）
+_RE_YEAR_LED = re.compile(
+    r"(?=\d{4}(?:年第?[三3]季度报告"
+    r"|\s*年\s*\d{1,2}\s*月\s*\d{1,2}\s*日"
+    r"|\s*(?:度|年度)"
+    r"|\s*(?:Annual\s+Report|年度报告|年报)))",
+    _I,
+)
+
+
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre_parse
+
+_Rule = tuple[str, re.Pattern, int | None]
+
+
+def _prefix_max_width(prefix: str) -> int | None:
+    """锚点之前那段正则能匹配的最大长度；含 + / * / {n,} 等无上界量词或无法单独解析时返回 None"""
+    try:
+        _, hi = _sre_parse.parse(prefix).getwidth()
+    except Exception:
+        return None
+    if hi >= _sre_parse.MAXREPEAT - 1:
+        return None
+    return int(hi)
+
+
+def _compile_all(patterns: tuple[tuple[str, str], ...], flags: int = _I) -> tuple[_Rule, ...]:
+    """编译规则表
+
+    每条规则附带一个小写字面锚点：锚点不在文本中时该正则必然不命中，可直接跳过。
+    lookback 为匹配起点到锚点的最大距离，扫描可从首个锚点前 lookback 处开始；
+    锚点前含 \\s+、.* 等无上界部分时距离无上界，记为 None（从头扫描）。
+    """
+    rules = []
+    for anchor, p in patterns:
+        idx = p.lower().find(anchor)
+        if idx == 0:
+            lookback: int | None = 0
+        elif idx < 0:
+            lookback = None
+        else:
+            lookback = _prefix_max_width(p[:idx])
+        rules.append((anchor, re.compile(p, flags), lookback))
+    return tuple(rules)
+
+
+def _scan_start(lookback: int | None, idx: int) -> int:
+    """由锚点首次出现位置 idx 得到正则的起始扫描位置；锚点不存在时返回 -1"""
+    if idx <= 0:
+        return idx
+    if lookback is None:
+        return 0
+    return max(0, idx - lookback)
+
+
+# ========== 直接提取的百分比指标 ==========
+
+# Gross margin (Tesla format: "Gross margin total automotive 18.4 %")
+_GROSS_MARGIN_PATTERNS = _compile_all((
+    ("margin", r"Gross\s+margin\s+(?:total\s+)?(?:automotive)?\s*([0-9.]+)\s*%"),
+    ("margin", r"Gross\s+margin\s*[：:\s]*([0-9.]+)\s*%"),
+    ("毛利率", r"毛利率[：:\s]*([0-9.]+)\s*%?"),
+))
+
+_NET_MARGIN_PATTERNS = _compile_all((
+    ("margin", r"Net\s+(?:profit\s+)?margin\s*[：:\s]*([0-9.]+)\s*%"),
+    ("净利率", r"净利率[：:\s]*([0-9.]+)\s*%?"),
+    ("销售净利率", r"销售净利率[：:\s]*([0-9.]+)\s*%?"),
+))
+
+# ROE - 银行财报格式
+_ROE_PATTERNS = _compile_all((
+    ("加权平均净资产收益率", r"加权平均净资产收益率[（(]年化[)）]\s*([0-9.]+)%"),
+    ("净资产收益率", r"净资产收益率[：:\s]*([0-9.]+)\s*%?"),
+    ("roe", r"ROE[：:\s]*([0-9.]+)\s*%?"),
+))
+
+# ROA - 银行财报格式
+_ROA_PATTERNS = _compile_all((
+    ("平均总资产收益率", r"平均总资产收益率[（(]年化[)）]\s*([0-9.]+)%"),
+    ("总资产收益率", r"总资产收益率[：:\s]*([0-9.]+)\s*%?"),
+    ("roa", r"ROA[：:\s]*([0-9.]+)\s*%?"),
+))
+
+# ========== 利润表（DOTALL：表格里的数字常被换行打散，. 需要跨行）==========
+
+_I_DOTALL = _I | re.DOTALL
+
+# Total revenues - 支持多种格式
+_REVENUE_PATTERNS = _compile_all((
+    ("sales", r"Total\s+net\s+sales\s*\$?\s*([0-9,\s]+)"),  # Apple 格式优先
+    ("revenues", r"Total\s+net\s+revenues\s*\$?\s*([0-9,\s]+)"),
+    ("revenue", r"Total\s+revenues?\s*\$?\s*([0-9,\s]+)"),
+    ("sales", r"Net\s+sales\s*\$?\s*([0-9,\s]+)"),
+    ("revenues", r"Net\s+revenues\s*\$?\s*([0-9,\s]+)"),
+    ("operatingrevenue", r"Operatingrevenue\s*\(RMB\)\s*([0-9,\s]+(?:\.[0-9]+)?)"),  # 五粮液格式
+    ("revenue", r"Operating\s+revenue\s*\(RMB\)\s*([0-9,\s]+(?:\.[0-9]+)?)"),
+    ("营业收入", r"营业收入[：:\s]*([0-9,\s]+)"),
+    ("实现营业收入", r"实现营业收入([0-9,\s]+(?:\.[0-9]+)?)"),  # 银行财报格式
+), _I_DOTALL)
+
+# Cost of revenues / Cost of sales
+_COST_PATTERNS = _compile_all((
+    ("cost", r"Total\s+cost\s+of\s+(?:revenues?|sales)\s*\$?\s*([0-9,\s]+)"),
+    ("cost", r"Cost\s+of\s+(?:revenues?|sales)\s*\$?\s*([0-9,\s]+)"),
+    ("sales:", r"Cost\s+of\s+sales:\s*\n?\s*Products?\s*\$?\s*([0-9,\s]+)"),  # Apple 格式
+    ("营业成本", r"营业成本[：:\s]*([0-9,\s]+)"),
+), _I_DOTALL)
+
+# Gross profit / Gross margin
+_GROSS_PROFIT_PATTERNS = _compile_all((
+    ("gross", r"Gross\s+(?:profit|margin)\s*\$?\s*([0-9,\s]+)"),
+    ("毛利", r"毛利[润]?[：:\s]*([0-9,\s]+)"),
+), _I_DOTALL)
+
+# Net income - 支持多种格式
+_NET_PROFIT_PATTERNS = _compile_all((
+    ("stockholder", r"Net\s+income\s+attributable\s+to\s+common\s+stockholders?\s*\$?\s*([0-9,\s]+)"),
+    ("income", r"Net\s+income\s*\$?\s*([0-9,\s]+)"),
+    ("earnings", r"Net\s+earnings\s*\$?\s*([0-9,\s]+)"),
+    ("thelistedcompany", r"thelistedcompany.s\s+([0-9,\s]+(?:\.[0-9]+)?)"),  # 五粮液格式 - 用.匹配任意引号
+    ("shareholders", r"Net\s+profit\s+attributable\s+to.*shareholders\s*\(RMB\)\s*([0-9,\s]+(?:\.[0-9]+)?)"),
+    ("归属于上市公司股东的净利润", r"归属于上市公司股东的净利润[（(]元[)）]\s*([0-9,\s]+(?:\.[0-9]+)?)"),  # A股季报格式
+    ("净利润", r"净利润[：:\s]*([0-9,\s]+)"),
+    ("股东的净利润", r"归属于.*股东的净利润\s*([0-9,\s]+)"),  # 银行财报格式
+), _I_DOTALL)
+
+# ========== 资产负债表 ==========
+
+_TOTAL_ASSETS_PATTERNS = _compile_all((
+    ("assets", r"Total\s+assets\s*\$?\s*([0-9,\s]+)"),
+    ("totalassets", r"Totalassets\s*\(RMB\)\s*([0-9,\s]+(?:\.[0-9]+)?)"),  # 五粮液格式
+    ("资产总计", r"资产总计\s+([0-9,\s]+(?:\.[0-9]+)?)"),  # A股季报格式
+    ("资产总", r"资产总[计额][：:\s]*([0-9,\s]+)"),
+    ("资产总额", r"资产总额\s*([0-9,\s]+)"),  # 银行财报格式
+))
+
+_TOTAL_EQUITY_PATTERNS = _compile_all((
+    ("stockholders", r"Total\s+stockholders['']?\s*equity\s*\$?\s*\(?([0-9,\s]+)\)?"),
+    ("equity", r"Total\s+equity\s*\$?\s*\(?([0-9,\s]+)\)?"),
+    ("所有者权益合计", r"所有者权益合计[：:\s]*([0-9,\s]+)"),
+    ("股东权益", r"股东权益\s*([0-9,\s]+)"),  # 银行财报格式
+    ("股东的股东权益", r"归属于.*股东的股东权益\s*([0-9,\s]+)"),
+))
+
+_TOTAL_LIABILITIES_PATTERNS = _compile_all((
+    ("liabilities", r"Total\s+liabilities\s*\$?\s*([0-9,\s]+)"),
+    ("负债总", r"负债总[计额][：:\s]*([0-9,\s]+)"),
+    ("负债合计", r"负债合计[：:\s]*([0-9,\s]+)"),
+))
+
+_CURRENT_ASSETS_PATTERNS = _compile_all((
+    ("current", r"Total\s+current\s+assets\s*\$?\s*([0-9,\s]+)"),
+    ("流动资产合计", r"流动资产合计[：:\s]*([0-9,\s]+)"),
+))
+
+_CURRENT_LIABILITIES_PATTERNS = _compile_all((
+    ("current", r"Total\s+current\s+liabilities\s*\$?\s*([0-9,\s]+)"),
+    ("流动负债合计", r"流动负债合计[：:\s]*([0-9,\s]+)"),
+))
+
+_CASH_PATTERNS = _compile_all((
+    ("equivalents", r"Cash\s+and\s+cash\s+equivalents\s*\$?\s*([0-9,\s]+)"),
+    ("货币资金", r"货币资金[：:\s]*([0-9,\s]+)"),
+))
+
+_INVENTORY_PATTERNS = _compile_all((
+    ("inventor", r"Inventor(?:y|ies)\s*\$?\s*([0-9,\s]+)"),
+    ("存货", r"存货[：:\s]*([0-9,\s]+)"),
+))
+
+_RECEIVABLES_PATTERNS = _compile_all((
+    ("receivable", r"Accounts\s+receivable[^$]*\$?\s*([0-9,\s]+)"),
+    ("应收账款", r"应收账款[：:\s]*([0-9,\s]+)"),
+))
+
+
+# 数字清洗：去掉千分位逗号、空格和美元符号；跨行匹配时连换行一起去掉
+_NUMSTRIP_TABLE = str.maketrans("", "", ", $")
+_NUMSTRIP_LINES_TABLE = str.maketrans("", "", ", $\n")
+
+
+def _anchor_parts(*tables: tuple[_Rule, ...]) -> dict[str, tuple[str, ...]]:
+    """汇总全部规则的锚点，并记下每个锚点包含的更短锚点"""
+    anchors = {rule[0] for table in tables for rule in table}
+    return {a: tuple(b for b in anchors if len(b) < len(a) and b in a) for a in anchors}
+
+
+_ANCHOR_PARTS = _anchor_parts(
+    _GROSS_MARGIN_PATTERNS, _NET_MARGIN_PATTERNS, _ROE_PATTERNS, _ROA_PATTERNS,
+    _REVENUE_PATTERNS, _COST_PATTERNS, _GROSS_PROFIT_PATTERNS, _NET_PROFIT_PATTERNS,
+    _TOTAL_ASSETS_PATTERNS, _TOTAL_EQUITY_PATTERNS, _TOTAL_LIABILITIES_PATTERNS,
+    _CURRENT_ASSETS_PATTERNS, _CURRENT_LIABILITIES_PATTERNS,
+    _CASH_PATTERNS, _INVENTORY_PATTERNS, _RECEIVABLES_PATTERNS,
+)
+
+
+class _AnchorHits(dict):
+    """锚点 -> 首次出现位置（-1 表示不存在），按需查找并缓存
+
+    各规则共用一张表，同一锚点每篇文档只查找一次；短锚点缺失时，包含它的长锚点直接判缺失。
+    """
+
+    __slots__ = ("_lowered", "_aligned")
+
+    def __init__(self, text: str):
+        super().__init__()
+        self._lowered = text.lower()
+        # lower() 个别字符会改变长度，此时下标与原文不再对齐，命中的锚点一律从头扫描
+        self._aligned = len(self._lowered) == len(text)
+
+    def __missing__(self, anchor: str) -> int:
+        if any(self[p] < 0 for p in _ANCHOR_PARTS.get(anchor, ())):
+            idx = -1
+        else:
+            idx = self._lowered.find(anchor)
+            if idx > 0 and not self._aligned:
+                idx = 0
+        self[anchor] = idx
+        return idx
+
+
+def _parse_number(raw: str, table: dict[int, None]) -> float | None:
+    """清洗并解析一个捕获到的金额；括号表示负数，无法解析返回 None"""
+    num_str = raw.translate(table).strip()
+    if num_str[:1] == "(" and num_str[-1:] == ")":
+        num_str = "-" + num_str[1:-1]
+    try:
+        return float(num_str)
+    except ValueError:
+        return None
+
+
+def _find_first_number(
+    patterns: tuple[_Rule, ...],
+    txt: str,
+    hits: _AnchorHits,
+    min_value: float = 0,
+    join_lines: bool = False,
+) -> float | None:
+    """提取第一个匹配的数字（hits 为锚点位置表；join_lines 时数字内的换行视作空格）"""
+    table = _NUMSTRIP_LINES_TABLE if join_lines else _NUMSTRIP_TABLE
+    for anchor, pattern, lookback in patterns:
+        start = _scan_start(lookback, hits[anchor])
+        if start < 0:
+            continue
+        # finditer 惰性推进：拿到第一个合格数字即返回，不再扫完整篇
+        for m in pattern.finditer(txt, start):
+            val = _parse_number(m.group(1), table)
+            if val is not None and abs(val) >= min_value:
+                return val
+    return None
+
+
+def _find_percentage(patterns: tuple[_Rule, ...], txt: str, hits: _AnchorHits) -> float | None:
+    """提取百分比"""
+    for anchor, pattern, lookback in patterns:
+        start = _scan_start(lookback, hits[anchor])
+        if start < 0:
+            continue
+        for m in pattern.finditer(txt, start):
+            # 百分比规则的捕获组都是 [0-9.]+，不含逗号/百分号/空白，无需清洗
+            try:
+                val = float(m.group(1))
+            except ValueError:
+                continue
+            if 0 < val < 500:  # 合理的百分比范围（ROE/ROA 可能 >100）
+                return val
+    return None
+
+
 def extract_financials_from_pdf(pdf_path: str, use_ai: bool = True, force_ai: bool = False) -> ExtractedFinancials:
     """从 PDF 中提取财务数据 - 支持中英文，可选 AI 增强"""
     max_pages = int((os.environ.get("PDF_TEXT_MAX_PAGES") or "20").strip() or "20")
     max_chars = int((os.environ.get("PDF_TEXT_MAX_CHARS") or "80000").strip() or "80000")
+    # 文本层由 extract_pdf_text 按文件版本缓存；正则与 AI 增强每次重跑，AI 临时失败或补上 API Key 后重试即可生效
     # AI-only path should avoid heavy extractors (pdfplumber/pdfminer/OCR) to prevent server OOM/hangs.
     text = extract_pdf_text(pdf_path, max_pages=max_pages, max_chars=max_chars, fast_only=bool(force_ai))
     if not text:
@@ -69,235 +382,103 @@ def extract_financials_from_pdf(pdf_path: str, use_ai: bool = True, force_ai: bo
 
     result = ExtractedFinancials()
 
-    # Some PDFs place numbers in tables with frequent newlines; keep a no-newline version for regex.
-    text_no_newline = text.replace("\n", " ")
+    # force_ai 时 AI 调用不依赖正则结果：先在后台线程发出请求，让下面的正则提取与网络等待重叠
+    ai_future = None
+    if use_ai and force_ai:
+        from core.llm_qwen import extract_financials_with_ai, get_api_key
+        if not get_api_key():
+            raise RuntimeError("ai_required_no_api_key")
+        ai_executor = ThreadPoolExecutor(max_workers=1)
+        ai_future = ai_executor.submit(extract_financials_with_ai, text, raise_on_error=True)
+        ai_executor.shutdown(wait=False)
+
+    # 锚点预筛：锚点缺失的规则直接跳过
+    hits = _AnchorHits(text)
 
     # ========== 提取报告期 ==========
-    month_map = {
-        "january": 1,
-        "february": 2,
-        "march": 3,
-        "april": 4,
-        "may": 5,
-        "june": 6,
-        "july": 7,
-        "august": 8,
-        "september": 9,
-        "october": 10,
-        "november": 11,
-        "december": 12,
-    }
-
-    date_candidates: list[tuple[int, int, int]] = []
+    # 只保留最晚的候选日期（年, 月, 日），不必收集全部命中再取 max
+    best_date: tuple[int, int, int] | None = None
 
     def _add_date(y: str, m: str | int, d: str) -> None:
+        nonlocal best_date
         try:
             yi = int(y)
             di = int(d)
             if isinstance(m, int):
                 mi = int(m)
             else:
-                mi = month_map.get(str(m).lower().strip(), 0)
+                mi = _MONTH_MAP.get(str(m).lower().strip(), 0)
             if yi <= 1900 or mi <= 0 or mi > 12 or di <= 0 or di > 31:
                 return
-            date_candidates.append((yi, mi, di))
+            if best_date is None or (yi, mi, di) > best_date:
+                best_date = (yi, mi, di)
         except Exception:
             return
 
-    for mm, dd, yy in re.findall(
-        r"fiscal\s+year\s+ended\s+(\w+)\s+(\d{1,2}),?\s+(\d{4})",
-        text,
-        re.IGNORECASE,
-    ):
+    for mm, dd, yy in _RE_YEAR_ENDED.findall(text):
         _add_date(yy, mm, dd)
 
-    for mm, dd, yy in re.findall(
-        r"(?:Year|year)\s+[Ee]nded\s+(\w+)\s+(\d{1,2}),?\s+(\d{4})",
-        text,
-        re.IGNORECASE,
-    ):
+    for mm, dd, yy in _RE_AS_OF.findall(text):
         _add_date(yy, mm, dd)
 
-    for mm, dd, yy in re.findall(r"as\s+of\s+(\w+)\s+(\d{1,2}),?\s+(\d{4})", text, re.IGNORECASE):
-        _add_date(yy, mm, dd)
+    cn_quarterly = cn_annual = annual_match = None
+    for hit in _RE_YEAR_LED.finditer(text):
+        pos = hit.start()
+        cn_date = _RE_CN_DATE.match(text, pos)
+        if cn_date:
+            yy, mm, dd = cn_date.groups()
+            _add_date(yy, int(mm), dd)
+        if cn_quarterly is None:
+            cn_quarterly = _RE_CN_QUARTERLY.match(text, pos)
+        if cn_annual is None:
+            cn_annual = _RE_CN_ANNUAL.match(text, pos)
+        if annual_match is None:
+            annual_match = _RE_ANNUAL.match(text, pos)
 
-    cn_quarterly = re.search(r"(\d{4})年第?[三3]季度报告", text)
     if cn_quarterly:
         _add_date(cn_quarterly.group(1), 9, "30")
 
-    for yy, mm, dd in re.findall(r"(\d{4})\s*年\s*(\d{1,2})\s*月\s*(\d{1,2})\s*日", text):
-        _add_date(yy, int(mm), dd)
-
-    cn_annual = re.search(r"(\d{4})\s*(?:度|年度)", text)
     if cn_annual:
         _add_date(cn_annual.group(1), 12, "31")
 
-    quarterly_match = re.search(r"(?:Third|3rd|Q3)\s*(?:Quarterly\s*Report)?\s*(\d{4})", text, re.IGNORECASE)
+    quarterly_match = _RE_QUARTERLY.search(text)
     if quarterly_match:
         _add_date(quarterly_match.group(1), 9, "30")
 
-    annual_match = re.search(r"(\d{4})\s*(?:Annual\s+Report|年度报告|年报)", text, re.IGNORECASE)
     if annual_match:
         _add_date(annual_match.group(1), 12, "31")
 
-    if date_candidates:
-        yy, mm, dd = max(date_candidates)
+    if best_date is not None:
+        yy, mm, dd = best_date
         result.report_year = str(yy)
         result.report_period = f"{yy:04d}-{mm:02d}-{dd:02d}"
 
-    def find_first_number(patterns: list[str], txt: str, min_value: float = 0) -> float | None:
-        """提取第一个匹配的数字"""
-        for pattern in patterns:
-            matches = re.findall(pattern, txt, re.IGNORECASE)
-            for match in matches:
-                try:
-                    num_str = match.replace(",", "").replace(" ", "").replace("$", "").strip()
-                    if num_str.startswith("(") and num_str.endswith(")"):
-                        num_str = "-" + num_str[1:-1]
-                    val = float(num_str)
-                    if abs(val) >= min_value:
-                        return val
-                except (ValueError, TypeError):
-                    continue
-        return None
-
-    def find_percentage(patterns: list[str], txt: str) -> float | None:
-        """提取百分比"""
-        for pattern in patterns:
-            matches = re.findall(pattern, txt, re.IGNORECASE)
-            for match in matches:
-                try:
-                    num_str = match.replace(",", "").replace("%", "").strip()
-                    val = float(num_str)
-                    if 0 < val < 500:  # 合理的百分比范围（ROE/ROA 可能 >100）
-                        return val
-                except (ValueError, TypeError):
-                    continue
-        return None
-
     # ========== 直接提取百分比指标（优先级最高）==========
-
-    # Gross margin (Tesla format: "Gross margin total automotive 18.4 %")
-    result.gross_margin_direct = find_percentage([
-        r"Gross\s+margin\s+(?:total\s+)?(?:automotive)?\s*([0-9.]+)\s*%",
-        r"Gross\s+margin\s*[：:\s]*([0-9.]+)\s*%",
-        r"毛利率[：:\s]*([0-9.]+)\s*%?",
-    ], text)
-
-    # Net margin
-    result.net_margin_direct = find_percentage([
-        r"Net\s+(?:profit\s+)?margin\s*[：:\s]*([0-9.]+)\s*%",
-        r"净利率[：:\s]*([0-9.]+)\s*%?",
-        r"销售净利率[：:\s]*([0-9.]+)\s*%?",
-    ], text)
-
-    # ROE - 银行财报格式
-    result.roe_direct = find_percentage([
-        r"加权平均净资产收益率[（(]年化[)）]\s*([0-9.]+)%",
-        r"净资产收益率[：:\s]*([0-9.]+)\s*%?",
-        r"ROE[：:\s]*([0-9.]+)\s*%?",
-    ], text)
-
-    # ROA - 银行财报格式
-    result.roa_direct = find_percentage([
-        r"平均总资产收益率[（(]年化[)）]\s*([0-9.]+)%",
-        r"总资产收益率[：:\s]*([0-9.]+)\s*%?",
-        r"ROA[：:\s]*([0-9.]+)\s*%?",
-    ], text)
+    result.gross_margin_direct = _find_percentage(_GROSS_MARGIN_PATTERNS, text, hits)
+    result.net_margin_direct = _find_percentage(_NET_MARGIN_PATTERNS, text, hits)
+    result.roe_direct = _find_percentage(_ROE_PATTERNS, text, hits)
+    result.roa_direct = _find_percentage(_ROA_PATTERNS, text, hits)
 
     # ========== 利润表 ==========
-
-    # Total revenues - 支持多种格式
-    result.revenue = find_first_number([
-        r"Total\s+net\s+sales\s*\$?\s*([0-9,\s]+)",  # Apple 格式优先
-        r"Total\s+net\s+revenues\s*\$?\s*([0-9,\s]+)",
-        r"Total\s+revenues?\s*\$?\s*([0-9,\s]+)",
-        r"Net\s+sales\s*\$?\s*([0-9,\s]+)",
-        r"Net\s+revenues\s*\$?\s*([0-9,\s]+)",
-        r"Operatingrevenue\s*\(RMB\)\s*([0-9,\s]+(?:\.[0-9]+)?)",  # 五粮液格式
-        r"Operating\s+revenue\s*\(RMB\)\s*([0-9,\s]+(?:\.[0-9]+)?)",
-        r"营业收入[：:\s]*([0-9,\s]+)",
-        r"实现营业收入([0-9,\s]+(?:\.[0-9]+)?)",  # 银行财报格式
-    ], text_no_newline, min_value=1000)
-
-    # Cost of revenues / Cost of sales
-    result.cost = find_first_number([
-        r"Total\s+cost\s+of\s+(?:revenues?|sales)\s*\$?\s*([0-9,\s]+)",
-        r"Cost\s+of\s+(?:revenues?|sales)\s*\$?\s*([0-9,\s]+)",
-        r"Cost\s+of\s+sales:\s*\n?\s*Products?\s*\$?\s*([0-9,\s]+)",  # Apple 格式
-        r"营业成本[：:\s]*([0-9,\s]+)",
-    ], text_no_newline, min_value=1000)
-
-    # Gross profit / Gross margin
-    result.gross_profit = find_first_number([
-        r"Gross\s+(?:profit|margin)\s*\$?\s*([0-9,\s]+)",
-        r"毛利[润]?[：:\s]*([0-9,\s]+)",
-    ], text_no_newline, min_value=100)
-
-    # Net income - 支持多种格式
-    result.net_profit = find_first_number([
-        r"Net\s+income\s+attributable\s+to\s+common\s+stockholders?\s*\$?\s*([0-9,\s]+)",
-        r"Net\s+income\s*\$?\s*([0-9,\s]+)",
-        r"Net\s+earnings\s*\$?\s*([0-9,\s]+)",
-        r"thelistedcompany.s\s+([0-9,\s]+(?:\.[0-9]+)?)",  # 五粮液格式 - 用.匹配任意引号
-        r"Net\s+profit\s+attributable\s+to.*shareholders\s*\(RMB\)\s*([0-9,\s]+(?:\.[0-9]+)?)",
-        r"归属于上市公司股东的净利润[（(]元[)）]\s*([0-9,\s]+(?:\.[0-9]+)?)",  # A股季报格式
-        r"净利润[：:\s]*([0-9,\s]+)",
-        r"归属于.*股东的净利润\s*([0-9,\s]+)",  # 银行财报格式
-    ], text_no_newline, min_value=100)
+    result.revenue = _find_first_number(_REVENUE_PATTERNS, text, hits, min_value=1000, join_lines=True)
+    result.cost = _find_first_number(_COST_PATTERNS, text, hits, min_value=1000, join_lines=True)
+    result.gross_profit = _find_first_number(_GROSS_PROFIT_PATTERNS, text, hits, min_value=100, join_lines=True)
+    result.net_profit = _find_first_number(_NET_PROFIT_PATTERNS, text, hits, min_value=100, join_lines=True)
 
     # ========== 资产负债表 ==========
-
-    result.total_assets = find_first_number([
-        r"Total\s+assets\s*\$?\s*([0-9,\s]+)",
-        r"Totalassets\s*\(RMB\)\s*([0-9,\s]+(?:\.[0-9]+)?)",  # 五粮液格式
-        r"资产总计\s+([0-9,\s]+(?:\.[0-9]+)?)",  # A股季报格式
-        r"资产总[计额][：:\s]*([0-9,\s]+)",
-        r"资产总额\s*([0-9,\s]+)",  # 银行财报格式
-    ], text, min_value=1000)
-
-    result.total_equity = find_first_number([
-        r"Total\s+stockholders['']?\s*equity\s*\$?\s*\(?([0-9,\s]+)\)?",
-        r"Total\s+equity\s*\$?\s*\(?([0-9,\s]+)\)?",
-        r"所有者权益合计[：:\s]*([0-9,\s]+)",
-        r"股东权益\s*([0-9,\s]+)",  # 银行财报格式
-        r"归属于.*股东的股东权益\s*([0-9,\s]+)",
-    ], text, min_value=100)
-
-    result.total_liabilities = find_first_number([
-        r"Total\s+liabilities\s*\$?\s*([0-9,\s]+)",
-        r"负债总[计额][：:\s]*([0-9,\s]+)",
-        r"负债合计[：:\s]*([0-9,\s]+)",
-    ], text, min_value=1000)
+    result.total_assets = _find_first_number(_TOTAL_ASSETS_PATTERNS, text, hits, min_value=1000)
+    result.total_equity = _find_first_number(_TOTAL_EQUITY_PATTERNS, text, hits, min_value=100)
+    result.total_liabilities = _find_first_number(_TOTAL_LIABILITIES_PATTERNS, text, hits, min_value=1000)
     
     # 银行特殊：如果没有直接的负债数据，用资产-权益计算
     if not result.total_liabilities and result.total_assets and result.total_equity:
         result.total_liabilities = result.total_assets - result.total_equity
 
-    result.current_assets = find_first_number([
-        r"Total\s+current\s+assets\s*\$?\s*([0-9,\s]+)",
-        r"流动资产合计[：:\s]*([0-9,\s]+)",
-    ], text, min_value=100)
-
-    result.current_liabilities = find_first_number([
-        r"Total\s+current\s+liabilities\s*\$?\s*([0-9,\s]+)",
-        r"流动负债合计[：:\s]*([0-9,\s]+)",
-    ], text, min_value=100)
-
-    result.cash = find_first_number([
-        r"Cash\s+and\s+cash\s+equivalents\s*\$?\s*([0-9,\s]+)",
-        r"货币资金[：:\s]*([0-9,\s]+)",
-    ], text, min_value=10)
-
-    result.inventory = find_first_number([
-        r"Inventor(?:y|ies)\s*\$?\s*([0-9,\s]+)",
-        r"存货[：:\s]*([0-9,\s]+)",
-    ], text, min_value=10)
-
-    result.receivables = find_first_number([
-        r"Accounts\s+receivable[^$]*\$?\s*([0-9,\s]+)",
-        r"应收账款[：:\s]*([0-9,\s]+)",
-    ], text, min_value=10)
+    result.current_assets = _find_first_number(_CURRENT_ASSETS_PATTERNS, text, hits, min_value=100)
+    result.current_liabilities = _find_first_number(_CURRENT_LIABILITIES_PATTERNS, text, hits, min_value=100)
+    result.cash = _find_first_number(_CASH_PATTERNS, text, hits, min_value=10)
+    result.inventory = _find_first_number(_INVENTORY_PATTERNS, text, hits, min_value=10)
+    result.receivables = _find_first_number(_RECEIVABLES_PATTERNS, text, hits, min_value=10)
 
     # 如果没有权益但有资产和负债，计算权益
     if not result.total_equity and result.total_assets and result.total_liabilities:
@@ -306,20 +487,15 @@ def extract_financials_from_pdf(pdf_path: str, use_ai: bool = True, force_ai: bo
     # ========== AI 增强提取 ==========
     # force_ai=True: 每次都调用 AI；否则按命中率阈值触发
     if use_ai:
-        if force_ai:
-            try:
-                from core.llm_qwen import extract_financials_with_ai, merge_ai_extracted_data, get_api_key
-                if not get_api_key():
-                    raise RuntimeError("ai_required_no_api_key")
-                ai_data = extract_financials_with_ai(text, raise_on_error=True)
-                if ai_data:
-                    merge_ai_extracted_data(result, ai_data)
-                    setattr(result, "_ai_enhanced", True)
-                    setattr(result, "_ai_keys", list(ai_data.keys()))
-                else:
-                    raise RuntimeError("ai_extraction_empty")
-            except Exception as e:
-                raise
+        if ai_future is not None:
+            from core.llm_qwen import merge_ai_extracted_data
+            ai_data = ai_future.result()
+            if ai_data:
+                merge_ai_extracted_data(result, ai_data)
+                result.ai_enhanced = True
+                result.ai_keys = tuple(ai_data.keys())
+            else:
+                raise RuntimeError("ai_extraction_empty")
             return result
 
         # 计算已提取的关键指标数量
@@ -349,8 +525,8 @@ def extract_financials_from_pdf(pdf_path: str, use_ai: bool = True, force_ai: bo
                     ai_data = extract_financials_with_ai(text)
                     if ai_data:
                         merge_ai_extracted_data(result, ai_data)
-                        setattr(result, "_ai_enhanced", True)
-                        setattr(result, "_ai_keys", list(ai_data.keys()))
+                        result.ai_enhanced = True
+                        result.ai_keys = tuple(ai_data.keys())
                         print(f"AI extracted: {list(ai_data.keys())}")
             except Exception as e:
                 print(f"AI enhancement failed: {e}")
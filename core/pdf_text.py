@@ -1,9 +1,42 @@
 from __future__ import annotations
 
 import os
+import queue
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
+# 不可读字符：既非字母数字/空白，也非 CJK 汉字或常见标点。
+# re 的 \w 等价于 isalnum() 再加下划线，下划线不算可读，故单独列出。
+_UNREADABLE_RE = re.compile(
+    r"[^\w\s"
+    r"\u4e00-\u9fff\u3400-\u4dbf\U00020000-\U0002a6df\U0002a700-\U0002b73f"
+    r"\U0002b740-\U0002b81f\U0002b820-\U0002ceaf\uf900-\ufaff"
+    r".,;:!?$%()\-，。；：！？（）【】《》、]|_"
+)
+
+# ASCII 范围内的不可读字符（与 _UNREADABLE_RE 判定一致），translate 时删除
+_ASCII_UNREADABLE_DELETE = dict.fromkeys(
+    i for i in range(128) if _UNREADABLE_RE.fullmatch(chr(i))
+)
+
+# 控制字符（\x00-\x1F，保留 \t \n \r）替换为空格
+_CTRL_TRANS = dict.fromkeys([i for i in range(32) if i not in (9, 10, 13)], ord(" "))
+_CTRL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+# 同一组控制字符的字节形式：UTF-8 多字节序列不含 < 0x80 的字节，编码后按字节删除计数不会误算
+_CTRL_BYTES = bytes(i for i in range(32) if i not in (9, 10, 13))
+
+
+def _strip_ctrl(s: str) -> str:
+    # 纯 ASCII 文本走 translate 的 C 快速路径；含中文时 translate 需逐字符查表，正则替换更快
+    if s.isascii():
+        return s.translate(_CTRL_TRANS)
+    return _CTRL_RE.sub(" ", s)
+
+
 def _is_garbled_text(text: str) -> bool:
     """检测文本是否为乱码（CID 字体编码问题）"""
     if not text:
@@ -12,35 +45,20 @@ def _is_garbled_text(text: str) -> bool:
     cid_count = text.count("(cid:")
     if cid_count > 10:
         return True
-    # 检查可读字符比例
-    def _is_cjk(ch: str) -> bool:
-        o = ord(ch)
-        return (
-            0x4E00 <= o <= 0x9FFF
-            or 0x3400 <= o <= 0x4DBF
-            or 0x20000 <= o <= 0x2A6DF
-            or 0x2A700 <= o <= 0x2B73F
-            or 0x2B740 <= o <= 0x2B81F
-            or 0x2B820 <= o <= 0x2CEAF
-            or 0xF900 <= o <= 0xFAFF
-        )
-
-    readable = sum(
-        1
-        for c in text
-        if c.isalnum() or c.isspace() or _is_cjk(c) or c in ".,;:!?$%()-，。；：！？（）【】《》、"
-    )
+    # 检查可读字符比例：删掉不可读字符后剩下的长度即可读字符数（字符类扫描在 C 层完成）。
+    # 纯 ASCII 文本（pypdf 提取的英文年报很常见）用 translate 删字符更快。
+    if text.isascii():
+        readable = len(text.translate(_ASCII_UNREADABLE_DELETE))
+    else:
+        readable = len(_UNREADABLE_RE.sub("", text))
     if len(text) > 100 and readable / len(text) < 0.5:
         return True
 
     # 额外判定：大量不可打印控制字符（\x00-\x1F，排除常见空白）
-    ctrl = 0
-    sample = text[:5000]
-    for c in sample:
-        o = ord(c)
-        if o < 32 and c not in ("\n", "\r", "\t"):
-            ctrl += 1
     if len(text) > 200:
+        sample = text[:5000]
+        sample_b = sample.encode("utf-8", "replace")
+        ctrl = len(sample_b) - len(sample_b.translate(None, _CTRL_BYTES))
         # 对于 CID/编码错乱 PDF，控制字符会非常密集
         if ctrl > 30:
             return True
@@ -49,99 +67,445 @@ def _is_garbled_text(text: str) -> bool:
     return False
 
 
+# 进程级 tesserocr 引擎池，按 (lang, psm) 分组：worker 线程借出引擎、用完归还，
+# 语言模型跨调用复用（OCR 的线程池每次调用都会新建，线程局部存储留不住引擎）。
+# 同一引擎同一时刻只被一个线程使用；池中空闲引擎超过上限时多出的直接释放。
+_TESS_POOL_MAX = max(1, os.cpu_count() or 1)
+_TESS_POOLS: dict[tuple[str, int], queue.SimpleQueue] = {}
+_TESS_UNAVAILABLE: set[tuple[str, int]] = set()
+_TESS_LOCK = threading.Lock()
+
+
+def _tesserocr_acquire(lang: str, psm: int):
+    """借出一个 tesserocr 引擎；未安装或初始化失败时返回 None。
+
+    tesserocr 在进程内调用 libtesseract，语言模型只加载一次，
+    省去 pytesseract 每页启动子进程、重复加载模型的开销。
+    """
+    key = (lang, int(psm))
+    if key in _TESS_UNAVAILABLE:
+        return None
+    with _TESS_LOCK:
+        pool = _TESS_POOLS.setdefault(key, queue.SimpleQueue())
+    try:
+        return pool.get_nowait()
+    except queue.Empty:
+        pass
+    try:
+        import tesserocr
+
+        return tesserocr.PyTessBaseAPI(lang=lang, psm=int(psm))
+    except Exception:
+        _TESS_UNAVAILABLE.add(key)
+        return None
+
+
+def _tesserocr_release(lang: str, psm: int, api) -> None:
+    """归还引擎；池已满时释放模型"""
+    pool = _TESS_POOLS[(lang, int(psm))]
+    if pool.qsize() < _TESS_POOL_MAX:
+        pool.put(api)
+        return
+    try:
+        api.End()
+    except Exception:
+        pass
+
+
+def _tesserocr_available(lang: str, psm: int) -> bool:
+    """tesserocr 可用（借出后立即归还，顺带把引擎预热进池）"""
+    api = _tesserocr_acquire(lang, psm)
+    if api is None:
+        return False
+    _tesserocr_release(lang, psm, api)
+    return True
+
+
+def _ocr_image(img, lang: str, psm: int) -> str:
+    # 优先走进程内 tesserocr；图片路径（批量列表文件）仍交给 tesseract 命令行
+    if not isinstance(img, str):
+        api = _tesserocr_acquire(lang, psm)
+        if api is not None:
+            try:
+                api.SetImage(img)
+                return api.GetUTF8Text() or ""
+            except Exception:
+                pass
+            finally:
+                _tesserocr_release(lang, psm, api)
+
+    import pytesseract
+
+    page_text = ""
+    try:
+        page_text = pytesseract.image_to_string(img, lang=lang, config=f"--psm {psm}")
+    except Exception:
+        try:
+            page_text = pytesseract.image_to_string(img, lang=lang, config=f"--psm {psm}")
+        except Exception:
+            try:
+                page_text = pytesseract.image_to_string(img, lang="chi_sim+eng", config=f"--psm {psm}")
+            except Exception:
+                page_text = pytesseract.image_to_string(img, lang="eng", config=f"--psm {psm}")
+    return page_text or ""
+
+
+def _render_pages_fitz(doc, pages_0: list[int], dpi: int) -> list:
+    """把已打开的 PyMuPDF 文档中的一组页面（0 起始页码）渲染成灰度 PIL 图片，失败的页为 None。
+
+    PyMuPDF 不支持多线程使用（即便各线程各开一份文档也不行），只能在调用线程里渲染。
+    """
+    import fitz
+    from PIL import Image
+
+    images: list = []
+    zoom = max(0.5, float(dpi) / 72.0)
+    mat = fitz.Matrix(zoom, zoom)
+    for i in pages_0:
+        try:
+            page = doc.load_page(i)
+            pix = page.get_pixmap(matrix=mat, alpha=False, colorspace=fitz.csGRAY)
+            images.append(Image.frombytes("L", [pix.width, pix.height], pix.samples))
+        except Exception:
+            images.append(None)
+    return images
+
+
+def _ocr_images(images: list, lang: str, psm: int) -> list[str]:
+    """OCR 一组已渲染的页面图片，返回与 images 一一对应的文本（None 图片对应空串）。
+
+    供并行 worker 调用，只碰 PIL 图片，不碰 PyMuPDF 对象。
+    tesseract 子进程 / tesserocr 识别期间释放 GIL，多个 worker 可真正并行。
+    多页时只启动一次 tesseract（见 _ocr_image_batch），省去每页重复加载语言模型。
+    """
+    # 先查 OCR 缓存，只对未命中的页面调用 tesseract
+    out = [""] * len(images)
+    pending: list[tuple[int, object, Path | None]] = []
+    for k, img in enumerate(images):
+        if img is None:
+            continue
+        fp = _ocr_cache_path(img, lang, psm)
+        hit = _ocr_cache_read(fp)
+        if hit is not None:
+            out[k] = hit
+        else:
+            pending.append((k, img, fp))
+
+    # 没有 tesserocr 时才合并成一次 tesseract 调用；进程内引擎逐页识别即可
+    if len(pending) > 1 and not _tesserocr_available(lang, psm):
+        results = _ocr_image_batch([img for _, img, _ in pending], lang, psm)
+    else:
+        results = []
+        for _, img, _ in pending:
+            try:
+                results.append(_ocr_image(img, lang, psm))
+            except Exception:
+                results.append(None)
+    for (k, _, fp), text in zip(pending, results):
+        if text is not None:
+            out[k] = text
+            _ocr_cache_write(fp, text)
+    return out
+
+
+def _ocr_image_batch(images: list, lang: str, psm: int) -> list[str | None]:
+    """一次 tesseract 调用识别多张图片，返回与 images 一一对应的文本（识别失败为 None）。
+
+    tesseract 的输入若是文本文件，会把其中每行当作一张图片路径依次识别，
+    输出各页之间以换页符分隔。页数对不上或调用失败时退回逐张识别。
+    """
+    import tempfile
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="ocr_") as tmp:
+            paths = []
+            for k, img in enumerate(images):
+                fp = os.path.join(tmp, f"{k}.png")
+                img.save(fp)
+                paths.append(fp)
+            list_path = os.path.join(tmp, "pages.txt")
+            with open(list_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(paths) + "\n")
+            parts = _ocr_image(list_path, lang, psm).split("\f")
+        if len(parts) >= len(images):
+            return parts[: len(images)]
+    except Exception:
+        pass
+
+    out: list[str | None] = []
+    for img in images:
+        try:
+            out.append(_ocr_image(img, lang, psm))
+        except Exception:
+            out.append(None)
+    return out
+
+
+def _ocr_cache_path(img, lang: str, psm: int) -> Path | None:
+    """OCR 磁盘缓存文件路径：按渲染后的像素内容 + 语言 + psm 取哈希；关闭缓存时返回 None"""
+    try:
+        if not _ocr_cfg().cache_enabled:
+            return None
+    except Exception:
+        return None
+    try:
+        import hashlib
+
+        from core.db import get_app_data_dir
+
+        h = hashlib.blake2b(img.tobytes(), digest_size=16)
+        h.update(f"{img.mode}:{img.size}".encode())
+        d = get_app_data_dir() / "ocr_cache"
+        d.mkdir(parents=True, exist_ok=True)
+        return d / f"{h.hexdigest()}_{lang.replace('+', '-')}_{psm}.txt"
+    except Exception:
+        return None
+
+
+def _ocr_cache_read(fp: Path | None) -> str | None:
+    if fp is None:
+        return None
+    try:
+        text = fp.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    try:
+        # 命中时刷新 mtime：清理按 mtime 从旧到新删除，常用页面留得更久
+        os.utime(fp)
+    except OSError:
+        pass
+    return text
+
+
+# 本进程自上次清理以来写入缓存的字节数；None 表示启动后还没清理过
+_OCR_CACHE_WRITTEN: int | None = None
+_OCR_CACHE_LOCK = threading.Lock()
+
+
+def _ocr_cache_write(fp: Path | None, text: str) -> None:
+    global _OCR_CACHE_WRITTEN
+    if fp is None:
+        return
+    try:
+        # 先写临时文件再原子替换，并发 worker 不会读到半截内容
+        tmp = fp.with_name(f"{fp.name}.{os.getpid()}.{id(text)}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, fp)
+    except OSError:
+        return
+    try:
+        max_bytes = _ocr_cfg().cache_max_bytes
+    except Exception:
+        return
+    if max_bytes <= 0:
+        return
+    # 启动后首次写入、以及之后每写入约上限的 1/10 时清理一次，避免每次写入都扫描目录
+    with _OCR_CACHE_LOCK:
+        if _OCR_CACHE_WRITTEN is not None:
+            _OCR_CACHE_WRITTEN += len(text.encode("utf-8"))
+            if _OCR_CACHE_WRITTEN < max_bytes // 10:
+                return
+        _OCR_CACHE_WRITTEN = 0
+    _ocr_cache_prune(fp.parent, max_bytes)
+
+
+def _ocr_cache_prune(d: Path, max_bytes: int) -> None:
+    """缓存目录超过 max_bytes 时按 mtime 从旧到新删除，直到降到上限的 80%"""
+    try:
+        entries = []
+        total = 0
+        with os.scandir(d) as it:
+            for e in it:
+                if not e.name.endswith(".txt"):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+        if total <= max_bytes:
+            return
+        target = max_bytes * 8 // 10
+        entries.sort()
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+    except OSError:
+        pass
+
+
+def _ocr_image_cached(img, lang: str, psm: int) -> str:
+    """带磁盘缓存的单张图片 OCR"""
+    fp = _ocr_cache_path(img, lang, psm)
+    hit = _ocr_cache_read(fp)
+    if hit is not None:
+        return hit
+    text = _ocr_image(img, lang, psm)
+    _ocr_cache_write(fp, text)
+    return text
+
+
+# 提前停止 OCR 需要利润表、资产负债表两类锚点都出现：
+# "REVENUE"/"NET INCOME" 这类词在经营讨论、摘要页也常见，只看一类会在资产负债表页 OCR 之前就停下
+_OCR_STOP_IS_KEYWORDS = ("营业收入", "营业总收入", "净利润", "NET INCOME", "NET SALES", "REVENUE")
+_OCR_STOP_BS_KEYWORDS = ("资产总计", "负债合计", "TOTAL ASSETS", "TOTAL LIABILITIES")
+
+
+def _ocr_text_sufficient(texts: list[str], min_chars: int) -> bool:
+    """OCR 结果是否已足够：长度达标、非乱码，且利润表与资产负债表关键词各至少出现一个"""
+    joined = "\n\n".join(texts)
+    if len(joined) < min_chars or _is_garbled_text(joined):
+        return False
+    up = joined.upper()
+    return any(k in up for k in _OCR_STOP_IS_KEYWORDS) and any(k in up for k in _OCR_STOP_BS_KEYWORDS)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int((os.environ.get(name) or str(default)).strip() or str(default))
+
+
+@dataclass(frozen=True, slots=True)
+class OcrConfig:
+    """OCR 相关环境变量，进程内只解析一次（改配置需重启服务）"""
+
+    enable_ocr: bool
+    auto_fallback: bool
+    auto_max_pdf_bytes: int
+    auto_max_page_count: int
+    max_pages: int
+    dpi: int
+    start_page: int
+    lang: str
+    psm: int
+    auto_find: bool
+    probe_pages: int
+    probe_dpi: int
+    early_stop_chars: int
+    pages_per_call: int
+    concurrency: int
+    probe_reuse_chars: int
+    cache_enabled: bool
+    cache_max_bytes: int
+
+
+@lru_cache(maxsize=1)
+def _ocr_cfg() -> OcrConfig:
+    """解析 OCR 配置；数值格式错误时抛异常（调用方据此放弃 OCR）"""
+    try:
+        max_mb = float((os.environ.get("OCR_AUTO_MAX_PDF_MB") or "25").strip() or "25")
+    except Exception:
+        max_mb = 25
+    if max_mb <= 0:
+        max_mb = 25
+    try:
+        auto_max_page_count = _env_int("OCR_AUTO_MAX_PAGECOUNT", 300)
+    except Exception:
+        auto_max_page_count = 300
+    if auto_max_page_count <= 0:
+        auto_max_page_count = 300
+    return OcrConfig(
+        # OCR 非常消耗 CPU/内存（页面渲染 + tesseract），线上默认关闭，避免拖垮服务器。
+        # 如需强制开启：设置环境变量 ENABLE_OCR=1
+        enable_ocr=(os.environ.get("ENABLE_OCR") or "").strip() == "1",
+        # 对于乱码/扫描版 PDF，可开启轻量自动兜底：AUTO_OCR_FALLBACK=1（默认开启，但会做尺寸/页数保护）
+        auto_fallback=(os.environ.get("AUTO_OCR_FALLBACK") or "1").strip() != "0",
+        auto_max_pdf_bytes=int(max_mb * 1024 * 1024),
+        auto_max_page_count=auto_max_page_count,
+        # OCR 强依赖 CPU/内存：用环境变量调参，默认尽量保守
+        max_pages=_env_int("OCR_MAX_PAGES", 10),
+        dpi=_env_int("OCR_DPI", 120),
+        start_page=_env_int("OCR_START_PAGE", 1),
+        lang=(os.environ.get("OCR_LANG") or "eng").strip() or "eng",
+        psm=_env_int("OCR_PSM", 6),
+        auto_find=(os.environ.get("OCR_AUTO_FIND") or "1").strip() != "0",
+        probe_pages=_env_int("OCR_PROBE_PAGES", 6),
+        probe_dpi=_env_int("OCR_PROBE_DPI", 90),
+        # 已 OCR 出这么多有效文本即提前结束（0 表示关闭）
+        early_stop_chars=_env_int("OCR_EARLY_STOP_CHARS", 5000),
+        # 每次 tesseract 调用识别的页数（摊薄进程启动与语言模型加载开销）
+        pages_per_call=max(1, _env_int("OCR_PAGES_PER_CALL", 2)),
+        # 并行 OCR 的 worker 数（默认 CPU 核数）
+        concurrency=max(1, _env_int("OCR_CONCURRENCY", os.cpu_count() or 1)),
+        # 探测页命中报表强关键词且文本够长时，直接复用探测 OCR 结果，不再高 DPI 重识别（0 表示关闭）
+        probe_reuse_chars=_env_int("OCR_PROBE_REUSE_CHARS", 1500),
+        cache_enabled=(os.environ.get("OCR_CACHE") or "1").strip() != "0",
+        # OCR 磁盘缓存目录的容量上限（MB），超出后按最久未用清理；0 表示不限制
+        cache_max_bytes=_env_int("OCR_CACHE_MAX_MB", 200) * 1024 * 1024,
+    )
+
+
 def _extract_with_ocr(path: str, max_pages: int = 10) -> str:
     """使用 OCR 提取 PDF 文本"""
-    # OCR 非常消耗 CPU/内存（pdf2image + tesseract），线上默认关闭，避免拖垮服务器。
-    # 如需强制开启：设置环境变量 ENABLE_OCR=1
-    # 对于乱码/扫描版 PDF，可开启轻量自动兜底：AUTO_OCR_FALLBACK=1（默认开启，但会做尺寸/页数保护）
-    enable_ocr = (os.environ.get("ENABLE_OCR") or "").strip() == "1"
-    auto_fallback = (os.environ.get("AUTO_OCR_FALLBACK") or "1").strip() != "0"
-    if (not enable_ocr) and (not auto_fallback):
+    try:
+        cfg = _ocr_cfg()
+    except Exception:
+        return ""
+    enable_ocr = cfg.enable_ocr
+    if (not enable_ocr) and (not cfg.auto_fallback):
         return ""
 
     # Safety guard for auto fallback: skip huge PDFs unless explicitly enabled.
     # Use OCR_AUTO_MAX_PDF_MB to adjust (default: 25MB).
-    if (not enable_ocr) and auto_fallback:
+    if (not enable_ocr) and cfg.auto_fallback:
         try:
             p = Path(path)
-            max_mb = float((os.environ.get("OCR_AUTO_MAX_PDF_MB") or "25").strip() or "25")
-            if max_mb <= 0:
-                max_mb = 25
-            max_bytes = int(max_mb * 1024 * 1024)
-            if p.exists() and p.stat().st_size > max_bytes:
+            if p.exists() and p.stat().st_size > cfg.auto_max_pdf_bytes:
                 return ""
         except Exception:
             pass
+    # CPU 绑定策略：并行度只在外层控制（OCR_CONCURRENCY 个 worker，外加服务本身的并发请求），
+    # tesseract 内部的 OpenMP 线程固定为 1，否则多个 tesseract 同时跑会超额订阅 CPU、反而更慢。
+    # 必须在首次调用 tesseract（或加载 tesserocr）之前设置；已显式配置的值不覆盖。
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
     try:
-        import pytesseract
-        
-        # OCR 强依赖 CPU/内存：用环境变量调参，默认尽量保守
-        ocr_max_pages = int((os.environ.get("OCR_MAX_PAGES") or "10").strip() or "10")
-        ocr_dpi = int((os.environ.get("OCR_DPI") or "120").strip() or "120")
-        ocr_start_page = int((os.environ.get("OCR_START_PAGE") or "1").strip() or "1")
-        ocr_lang = (os.environ.get("OCR_LANG") or "eng").strip() or "eng"
-        ocr_psm = int((os.environ.get("OCR_PSM") or "6").strip() or "6")
-        ocr_auto_find = (os.environ.get("OCR_AUTO_FIND") or "1").strip() != "0"
-        ocr_probe_pages = int((os.environ.get("OCR_PROBE_PAGES") or "6").strip() or "6")
-        ocr_probe_dpi = int((os.environ.get("OCR_PROBE_DPI") or "90").strip() or "90")
+        import pytesseract  # noqa: F401  未安装时直接放弃 OCR
+
+        ocr_max_pages = cfg.max_pages
+        ocr_dpi = cfg.dpi
+        ocr_lang = cfg.lang
+        ocr_psm = cfg.psm
+        ocr_probe_pages = cfg.probe_pages
+        ocr_probe_dpi = cfg.probe_dpi
+        ocr_early_stop_chars = cfg.early_stop_chars
+        ocr_pages_per_call = cfg.pages_per_call
+        ocr_concurrency = cfg.concurrency
+        ocr_probe_reuse_chars = cfg.probe_reuse_chars
         ocr_pages = min(max_pages, max(1, ocr_max_pages))
 
-        first_page = max(1, ocr_start_page)
-
-        def _ocr_image(img) -> str:
-            page_text = ""
-            try:
-                page_text = pytesseract.image_to_string(img, lang=ocr_lang, config=f"--psm {ocr_psm}")
-            except Exception:
-                try:
-                    page_text = pytesseract.image_to_string(img, lang=ocr_lang, config=f"--psm {ocr_psm}")
-                except Exception:
-                    try:
-                        page_text = pytesseract.image_to_string(img, lang="chi_sim+eng", config=f"--psm {ocr_psm}")
-                    except Exception:
-                        page_text = pytesseract.image_to_string(img, lang="eng", config=f"--psm {ocr_psm}")
-            return page_text or ""
+        first_page = max(1, cfg.start_page)
 
-        def _render_page_image_fitz(page_index_1: int, dpi: int):
-            """Render a 1-indexed page to a PIL Image using PyMuPDF."""
+        def _render_page_image_fitz(doc, page_index_1: int, mat):
+            """Render a 1-indexed page of an open PyMuPDF document to a PIL Image."""
             import fitz
             from PIL import Image
 
-            doc = fitz.open(str(path))
-            try:
-                idx0 = max(0, int(page_index_1) - 1)
-                page = doc.load_page(idx0)
-                zoom = max(0.5, float(dpi) / 72.0)
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            finally:
-                try:
-                    doc.close()
-                except Exception:
-                    pass
+            idx0 = max(0, int(page_index_1) - 1)
+            page = doc.load_page(idx0)
+            pix = page.get_pixmap(matrix=mat, alpha=False, colorspace=fitz.csGRAY)
+            return Image.frombytes("L", [pix.width, pix.height], pix.samples)
 
         pages_to_ocr_0: list[int] | None = None
+        # 可直接复用的探测 OCR 文本：0 起始页码 -> 文本
+        probe_reuse: dict[int, str] = {}
 
-        if ocr_auto_find and first_page == 1:
+        if cfg.auto_find and first_page == 1:
             try:
                 import fitz
 
+                # 探测阶段全程复用这一个文档对象，渲染完探测页即关闭
                 doc = fitz.open(str(path))
                 page_count = int(doc.page_count or 0)
-                try:
+                if page_count <= 0:
                     doc.close()
-                except Exception:
-                    pass
-
                 if page_count > 0:
-                    try:
-                        auto_max_page_count = int((os.environ.get("OCR_AUTO_MAX_PAGECOUNT") or "300").strip() or "300")
-                    except Exception:
-                        auto_max_page_count = 300
-                    if auto_max_page_count <= 0:
-                        auto_max_page_count = 300
-                    if (not enable_ocr) and page_count > auto_max_page_count:
+                    if (not enable_ocr) and page_count > cfg.auto_max_page_count:
+                        doc.close()
                         return ""
                     # Sample across the document; adapt step to the number of probe pages requested.
                     # Using a fixed //10 can miss statement pages for some PDFs.
@@ -151,51 +515,45 @@ def _extract_with_ocr(path: str, max_pages: int = 10) -> str:
                         candidates.append(1 + i * step)
                     candidates = [c for c in candidates if 1 <= c <= page_count]
 
-                    scored: list[tuple[int, float]] = []
-                    for c in candidates:
-                        try:
-                            # Prefer PyMuPDF rendering for probing; fall back to pdf2image if unavailable.
-                            s = ""
+                    # 第一步：用同一个已打开的文档渲染全部探测页（渲染失败的页跳过）
+                    probe_imgs: list = []
+                    try:
+                        probe_zoom = max(0.5, float(ocr_probe_dpi) / 72.0)
+                        probe_mat = fitz.Matrix(probe_zoom, probe_zoom)
+                        for c in candidates:
                             try:
-                                img = _render_page_image_fitz(c, ocr_probe_dpi)
-                                s = _ocr_image(img)
+                                probe_imgs.append(_render_page_image_fitz(doc, c, probe_mat))
                             except Exception:
-                                try:
-                                    from pdf2image import convert_from_path
-
-                                    imgs = convert_from_path(str(path), first_page=c, last_page=c, dpi=ocr_probe_dpi)
-                                    if imgs:
-                                        s = _ocr_image(imgs[0])
-                                except Exception:
-                                    s = ""
-
-                            s2 = s.strip()
-                            if not s2:
-                                continue
-                            head = s2[:2000]
-                            kw = 0
-                            up = head.upper()
-
-                            # Prefer true financial statement pages
-                            strong = (
-                                "NET SALES" in up
-                                or "CONSOLIDATED STATEMENTS" in up
-                                or "CONSOLIDATED FINANCIAL STATEMENTS" in up
-                                or "BALANCE SHEETS" in up
-                                or "STATEMENTS OF OPERATIONS" in up
-                                or "STATEMENTS OF CASH FLOWS" in up
-                            )
-                            if strong:
-                                kw += 10
-
-                            for k in ("CONSOLIDATED", "STATEMENTS", "REVENUE", "IN MILLIONS", "FORM 10-K"):
-                                if k in up:
-                                    kw += 1
-                            ascii_ratio = sum(1 for ch in head if (" " <= ch <= "~")) / max(1, len(head))
-                            score = kw * 10.0 + ascii_ratio
-                            scored.append((c, score))
+                                probe_imgs.append(None)
+                    finally:
+                        try:
+                            doc.close()
+                        except Exception:
+                            pass
+
+                    # 第二步：探测页并行 OCR（结果顺序与 candidates 一致）
+                    def _probe_ocr(img) -> str:
+                        if img is None:
+                            return ""
+                        try:
+                            return _ocr_image_cached(img, ocr_lang, ocr_psm)
                         except Exception:
-                            continue
+                            return ""
+
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    probe_workers = max(1, min(len(probe_imgs), ocr_concurrency))
+                    if probe_workers > 1:
+                        with ThreadPoolExecutor(max_workers=probe_workers) as ex:
+                            probe_texts = list(ex.map(_probe_ocr, probe_imgs))
+                    else:
+                        probe_texts = [_probe_ocr(img) for img in probe_imgs]
+
+                    scored: list[tuple[int, float]] = []
+                    for c, s in zip(candidates, probe_texts):
+                        score = _score_ocr_probe(s)
+                        if score is not None:
+                            scored.append((c, score))
 
                     # Pick several best pages (1-indexed) and OCR them (and their next page) to cover
                     # statements of operations / balance sheets / cash flows which may be separated.
@@ -212,6 +570,20 @@ def _extract_with_ocr(path: str, max_pages: int = 10) -> str:
                                 picked_0.append(p0 + 1)
                         pages_to_ocr_0 = picked_0[: max(1, ocr_pages)]
 
+                        if ocr_probe_reuse_chars > 0:
+                            probe_by_page = dict(zip(candidates, probe_texts))
+                            score_by_page = dict(scored)
+                            for p1 in picked_1:
+                                p0 = max(0, int(p1) - 1)
+                                s2 = (probe_by_page.get(p1) or "").strip()
+                                # 强关键词命中时 _score_ocr_probe 至少 100 分
+                                if (
+                                    p0 in pages_to_ocr_0
+                                    and score_by_page.get(p1, 0.0) >= 100.0
+                                    and len(s2) >= ocr_probe_reuse_chars
+                                ):
+                                    probe_reuse[p0] = s2
+
                         # Keep first_page for backwards compatible contiguous OCR if needed.
                         first_page = min(picked_1)
             except Exception:
@@ -219,54 +591,243 @@ def _extract_with_ocr(path: str, max_pages: int = 10) -> str:
 
         texts: list[str] = []
 
-        # Prefer PyMuPDF rendering to avoid external poppler dependency.
+        # 只用 PyMuPDF 渲染页面，不依赖外部 poppler
         try:
             import fitz
-            from PIL import Image
 
             doc = fitz.open(str(path))
-            page_count = int(doc.page_count or 0)
-            start_idx = max(0, int(first_page) - 1)
-            end_idx = min(page_count - 1, start_idx + ocr_pages - 1) if page_count > 0 else -1
-            zoom = max(0.5, float(ocr_dpi) / 72.0)
-            mat = fitz.Matrix(zoom, zoom)
-            if pages_to_ocr_0:
-                iter_pages = [i for i in pages_to_ocr_0 if 0 <= i < page_count]
-            else:
-                iter_pages = list(range(start_idx, end_idx + 1))
-
-            for i in iter_pages:
+            try:
+                page_count = int(doc.page_count or 0)
+                start_idx = max(0, int(first_page) - 1)
+                end_idx = min(page_count - 1, start_idx + ocr_pages - 1) if page_count > 0 else -1
+                if pages_to_ocr_0:
+                    iter_pages = [i for i in pages_to_ocr_0 if 0 <= i < page_count]
+                else:
+                    iter_pages = list(range(start_idx, end_idx + 1))
+
+                # 各页相互独立，并行 OCR；每个任务处理 ocr_pages_per_call 页（一次 tesseract 调用），
+                # 按批提交（每批 workers 个任务），批间检查是否已拿到足够的有效文本
+                # （够长、非乱码、含报表关键词），够了就不再渲染后续页面。
+                # 渲染留在当前线程（PyMuPDF 不支持多线程），渲染好一组就交给 worker 识别，
+                # 下一组的渲染与上一组的识别重叠。
+                # 结果按页码记录，最后按 iter_pages 顺序拼接，页序保持不变。
+                from concurrent.futures import ThreadPoolExecutor
+
+                text_by_page = {i: probe_reuse[i] for i in iter_pages if i in probe_reuse}
+                texts = [text_by_page[i] for i in iter_pages if i in text_by_page]
+                ocr_targets = [i for i in iter_pages if i not in text_by_page]
+                chunks = [ocr_targets[k:k + ocr_pages_per_call] for k in range(0, len(ocr_targets), ocr_pages_per_call)]
+                workers = max(1, min(len(chunks), ocr_concurrency))
+                with ThreadPoolExecutor(max_workers=workers) as ex:
+                    for b in range(0, len(chunks), workers):
+                        if ocr_early_stop_chars > 0 and _ocr_text_sufficient(texts, ocr_early_stop_chars):
+                            break
+                        futs = [
+                            (c, ex.submit(_ocr_images, _render_pages_fitz(doc, c, ocr_dpi), ocr_lang, ocr_psm))
+                            for c in chunks[b:b + workers]
+                        ]
+                        for c, fut in futs:
+                            text_by_page.update((i, t) for i, t in zip(c, fut.result()) if t)
+                        texts = [text_by_page[i] for i in iter_pages if i in text_by_page]
+            finally:
                 try:
-                    page = doc.load_page(i)
-                    pix = page.get_pixmap(matrix=mat, alpha=False)
-                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                    page_text = _ocr_image(img)
-                    if page_text:
-                        texts.append(page_text)
+                    doc.close()
                 except Exception:
-                    continue
-            try:
-                doc.close()
-            except Exception:
-                pass
-            if texts:
-                return "\n\n".join(texts)
+                    pass
         except Exception:
             pass
+        return "\n\n".join(texts)
+    except Exception:
+        return ""
 
-        # Fallback to pdf2image if available.
-        try:
-            from pdf2image import convert_from_path
-
-            last_page = max(first_page, first_page + ocr_pages - 1)
-            images = convert_from_path(str(path), first_page=first_page, last_page=last_page, dpi=ocr_dpi)
-            for img in images:
-                page_text = _ocr_image(img)
-                if page_text:
-                    texts.append(page_text)
-            return "\n\n".join(texts)
-        except Exception:
-            return ""
+
+# 页面预览打分用的关键词
+_PREVIEW_STRONG_EN = (
+    "CONSOLIDATED STATEMENTS",
+    "STATEMENTS OF OPERATIONS",
+    "STATEMENTS OF CASH FLOWS",
+    "BALANCE SHEETS",
+    "INCOME STATEMENT",
+    "FORM 10-K",
+)
+_PREVIEW_WEAK_EN = (
+    "REVENUE",
+    "NET INCOME",
+    "NET SALES",
+    "GROSS PROFIT",
+    "TOTAL ASSETS",
+    "TOTAL LIABILITIES",
+    "STOCKHOLDERS",
+    "IN MILLIONS",
+    "IN BILLIONS",
+)
+_PREVIEW_CN = (
+    "利润表",
+    "合并利润表",
+    "合并资产负债表",
+    "资产负债表",
+    "现金流量表",
+    "营业收入",
+    "营业总收入",
+    "净利润",
+    "归属于",
+    "毛利率",
+    "基本每股收益",
+)
+_NON_PRINTABLE_ASCII_RE = re.compile(r"[^ -~]+")
+
+
+def _printable_ascii_ratio(s: str) -> float:
+    """可打印 ASCII（空格到 ~）字符占比"""
+    if not s:
+        return 0.0
+    return (len(s) - sum(map(len, _NON_PRINTABLE_ASCII_RE.findall(s)))) / len(s)
+
+
+def _has_enough_digits(s: str, n: int = 20) -> bool:
+    """s 中数字字符（str.isdigit）是否不少于 n 个"""
+    # 先用 str.count 数 ASCII 数字（C 层扫描），够数即返回；
+    # 不够时再逐字符判断，把全角等其它数字也算进去
+    if sum(map(s.count, "0123456789")) >= n:
+        return True
+    return sum(1 for ch in s if ch.isdigit()) >= n
+
+
+def _score_preview(txt: str) -> float:
+    """按关键词给页面预览文本打分，用于挑选最可能是财务报表的页面"""
+    s = (txt or "").strip()
+    if not s:
+        return -1.0
+    head = s[:3000]
+    up = head.upper()
+    score = 0.0
+
+    # 关键词都很短，逐个 in 查找（C 层子串搜索）比合并成一个正则更快
+    if any(k in up for k in _PREVIEW_STRONG_EN):
+        score += 50
+    for k in _PREVIEW_WEAK_EN:
+        if k in up:
+            score += 5
+    for k in _PREVIEW_CN:
+        if k in head:
+            score += 5
+
+    score += _printable_ascii_ratio(head)
+    return score
+
+
+# OCR 探测页打分用的关键词（英文报表）
+_PROBE_STRONG_EN = (
+    "NET SALES",
+    "CONSOLIDATED STATEMENTS",
+    "CONSOLIDATED FINANCIAL STATEMENTS",
+    "BALANCE SHEETS",
+    "STATEMENTS OF OPERATIONS",
+    "STATEMENTS OF CASH FLOWS",
+)
+_PROBE_WEAK_EN = ("CONSOLIDATED", "STATEMENTS", "REVENUE", "IN MILLIONS", "FORM 10-K")
+
+
+def _score_ocr_probe(txt: str) -> float | None:
+    """给 OCR 探测页文本打分；空文本返回 None（不参与挑页）"""
+    s = (txt or "").strip()
+    if not s:
+        return None
+    head = s[:2000]
+    up = head.upper()
+    kw = 0
+    # Prefer true financial statement pages
+    if any(k in up for k in _PROBE_STRONG_EN):
+        kw += 10
+    for k in _PROBE_WEAK_EN:
+        if k in up:
+            kw += 1
+    return kw * 10.0 + _printable_ascii_ratio(head)
+
+
+# 扫描件判定缓存：(路径, mtime_ns, 探测页) -> 是否扫描件
+_SCANNED_CACHE: dict[tuple[str, int, tuple[int, ...]], bool] = {}
+# 挑页结果缓存：(路径, mtime_ns, max_pages) -> 页码（0 起始）
+_PAGE_PICK_CACHE: dict[tuple[str, int, int], tuple[int, ...]] = {}
+
+
+def _cache_put(cache: dict, key, value, maxsize: int = 128) -> None:
+    """写入小型进程内缓存；超出上限时淘汰最早写入的条目"""
+    if key not in cache and len(cache) >= maxsize:
+        cache.pop(next(iter(cache)))
+    cache[key] = value
+
+
+def _is_scanned_pdf(path: str, pages_0: list[int], page_text, min_chars: int = 100) -> bool:
+    """快速判断 PDF 是否为纯图片扫描件：待提取的页面（最多探测 3 页）都几乎没有文本层
+
+    page_text(i) 返回第 i 页（0 起始）的文本层内容。
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    key = (path, st.st_mtime_ns, tuple(pages_0[:3]))
+    cached = _SCANNED_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    scanned = False
+    try:
+        total = 0
+        for i in key[2]:
+            total += len(page_text(i).strip())
+            if total >= min_chars:
+                break
+        else:
+            scanned = bool(key[2])
+    except Exception:
+        # 探测失败时不下结论，按原流程逐个尝试文本提取器
+        scanned = False
+
+    _cache_put(_SCANNED_CACHE, key, scanned)
+    return scanned
+
+
+def _pdfplumber_text(path: str, page_indices: list[int], max_chars: int) -> str:
+    """pdfplumber 提取指定页文本（未去乱码判定）；失败返回空串"""
+    texts: list[str] = []
+    try:
+        import pdfplumber
+        with pdfplumber.open(path) as pdf:
+            # pdfplumber 逐页解析很慢：字数够了（反正最后会截断）或利润表、资产负债表锚点
+            # 都已出现（与 OCR 提前停止同一判定）就不再解析后续页面
+            total_len = 0
+            seen_is = seen_bs = False
+            for i in [i for i in page_indices if 0 <= i < len(pdf.pages)]:
+                try:
+                    page = pdf.pages[i]
+                    t = page.extract_text() or ""
+                    if t:
+                        texts.append(t)
+                        total_len += len(t)
+                        up = t.upper()
+                        seen_is = seen_is or any(k in up for k in _OCR_STOP_IS_KEYWORDS)
+                        seen_bs = seen_bs or any(k in up for k in _OCR_STOP_BS_KEYWORDS)
+                        if total_len >= max_chars or (seen_is and seen_bs):
+                            break
+                except Exception:
+                    continue
+    except Exception:
+        pass
+    if not texts:
+        return ""
+    return _strip_ctrl("\n\n".join(texts).strip())
+
+
+def _pdfminer_text(path: str, page_indices: list[int]) -> str:
+    """pdfminer.six 提取指定页文本；失败返回空串"""
+    try:
+        from pdfminer.high_level import extract_text as _pdfminer_extract_text
+
+        # pdfminer 的 page_numbers 是 0-indexed
+        page_numbers = [i for i in page_indices if i >= 0]
+        return (_pdfminer_extract_text(path, page_numbers=page_numbers) or "").strip()
     except Exception:
         return ""
 
@@ -276,11 +837,67 @@ def extract_pdf_text(
     max_pages: int = 2,
     max_chars: int = 5000,
     fast_only: bool = False,
+) -> str:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    # 以 (路径, mtime, 大小) 作键缓存：同一份 PDF 被正则/AI/公司名识别等多处重复解析时只解一次，
+    # 文件被覆盖后 mtime/size 变化自动失效
+    return _extract_pdf_text_cached(str(path), st.st_mtime_ns, st.st_size, max_pages, max_chars, fast_only)
+
+
+@lru_cache(maxsize=32)
+def _extract_pdf_text_cached(
+    path: str,
+    mtime_ns: int,
+    size: int,
+    max_pages: int,
+    max_chars: int,
+    fast_only: bool,
+) -> str:
+    return _extract_pdf_text(path, max_pages=max_pages, max_chars=max_chars, fast_only=fast_only)
+
+
+def _extract_pdf_text(
+    path: str | Path,
+    max_pages: int = 2,
+    max_chars: int = 5000,
+    fast_only: bool = False,
 ) -> str:
     p = Path(path)
     if not p.exists():
         return ""
 
+    # PyMuPDF 文档只打开一次，页面挑选、扫描件探测和各处 fitz 提取共用
+    fitz_doc = None
+    try:
+        import fitz
+
+        fitz_doc = fitz.open(str(p))
+    except Exception:
+        fitz_doc = None
+    try:
+        return _extract_pdf_text_with_doc(p, fitz_doc, max_pages, max_chars, fast_only)
+    finally:
+        if fitz_doc is not None:
+            try:
+                fitz_doc.close()
+            except Exception:
+                pass
+
+
+def _extract_pdf_text_with_doc(p: Path, fitz_doc, max_pages: int, max_chars: int, fast_only: bool) -> str:
+    fitz_texts: dict[int, str] = {}
+
+    def _fitz_page_text(i: int) -> str:
+        """PyMuPDF 单页文本；同一页只解析一次"""
+        if fitz_doc is None:
+            raise RuntimeError("fitz_unavailable")
+        if i not in fitz_texts:
+            fitz_texts[i] = fitz_doc.load_page(i).get_text("text") or ""
+        return fitz_texts[i]
+
     def _pick_pages_smart(page_count: int, k: int) -> list[int]:
         """Pick up to k pages (0-indexed) likely containing financial statements."""
         if page_count <= 0:
@@ -302,78 +919,17 @@ def extract_pdf_text(
 
         cands = sorted(candidates)
 
-        # Score pages by presence of keywords in a lightweight preview
-        def _score_preview(txt: str) -> float:
-            s = (txt or "").strip()
-            if not s:
-                return -1.0
-            head = s[:3000]
-            up = head.upper()
-            score = 0.0
-
-            strong_en = (
-                "CONSOLIDATED STATEMENTS" in up
-                or "STATEMENTS OF OPERATIONS" in up
-                or "STATEMENTS OF CASH FLOWS" in up
-                or "BALANCE SHEETS" in up
-                or "INCOME STATEMENT" in up
-                or "FORM 10-K" in up
-            )
-            if strong_en:
-                score += 50
-            for k2 in (
-                "REVENUE",
-                "NET INCOME",
-                "NET SALES",
-                "GROSS PROFIT",
-                "TOTAL ASSETS",
-                "TOTAL LIABILITIES",
-                "STOCKHOLDERS",
-                "IN MILLIONS",
-                "IN BILLIONS",
-            ):
-                if k2 in up:
-                    score += 5
-
-            # Chinese keywords
-            for k2 in (
-                "利润表",
-                "合并利润表",
-                "合并资产负债表",
-                "资产负债表",
-                "现金流量表",
-                "营业收入",
-                "营业总收入",
-                "净利润",
-                "归属于",
-                "毛利率",
-                "基本每股收益",
-            ):
-                if k2 in head:
-                    score += 5
-
-            ascii_ratio = sum(1 for ch in head if (" " <= ch <= "~")) / max(1, len(head))
-            score += ascii_ratio
-            return score
-
         previews: dict[int, float] = {}
 
         # Use PyMuPDF for preview scoring (fast and resilient); fall back to empty scores.
         try:
-            import fitz
-
-            doc = fitz.open(str(p))
+            if fitz_doc is None:
+                raise RuntimeError("fitz_unavailable")
             for idx in cands:
                 try:
-                    page = doc.load_page(idx)
-                    txt = page.get_text("text") or ""
-                    previews[idx] = _score_preview(txt)
+                    previews[idx] = _score_preview(_fitz_page_text(idx))
                 except Exception:
                     previews[idx] = -1.0
-            try:
-                doc.close()
-            except Exception:
-                pass
         except Exception:
             for idx in cands:
                 previews[idx] = 0.0
@@ -396,9 +952,6 @@ def extract_pdf_text(
             return s[:max_chars] + "\n..."
         return s
 
-    def _strip_ctrl(s: str) -> str:
-        return "".join(ch if (ord(ch) >= 32 or ch in ("\n", "\r", "\t")) else " " for ch in s)
-
     def _looks_like_useful_english(s: str) -> bool:
         try:
             up = (s or "").upper()
@@ -434,15 +987,17 @@ def extract_pdf_text(
     # Decide which pages to read. For long documents, pick pages smartly instead of only the first N.
     page_indices: list[int] = []
     try:
-        import fitz
-
-        doc0 = fitz.open(str(p))
-        page_count = int(doc0.page_count or 0)
-        try:
-            doc0.close()
-        except Exception:
-            pass
-        page_indices = _pick_pages_smart(page_count, max_pages)
+        if fitz_doc is None:
+            raise RuntimeError("fitz_unavailable")
+        # 同一文件（mtime 不变）同样的页数上限，挑页结果是确定的，直接复用
+        pick_key = (str(p), p.stat().st_mtime_ns, int(max_pages))
+        cached_pick = _PAGE_PICK_CACHE.get(pick_key)
+        if cached_pick is not None:
+            page_indices = list(cached_pick)
+        else:
+            page_count = int(fitz_doc.page_count or 0)
+            page_indices = _pick_pages_smart(page_count, max_pages)
+            _cache_put(_PAGE_PICK_CACHE, pick_key, tuple(page_indices))
     except Exception:
         page_indices = list(range(max(1, int(max_pages))))
 
@@ -450,22 +1005,16 @@ def extract_pdf_text(
     if fast_only:
         # Prefer PyMuPDF for fast and resilient extraction.
         try:
-            import fitz  # PyMuPDF
-
-            doc = fitz.open(str(p))
+            if fitz_doc is None:
+                raise RuntimeError("fitz_unavailable")
             buf: list[str] = []
-            for i in [i for i in page_indices if 0 <= i < int(doc.page_count or 0)]:
+            for i in [i for i in page_indices if 0 <= i < int(fitz_doc.page_count or 0)]:
                 try:
-                    page = doc.load_page(i)
-                    t = page.get_text("text") or ""
+                    t = _fitz_page_text(i)
                     if t:
                         buf.append(t)
                 except Exception:
                     continue
-            try:
-                doc.close()
-            except Exception:
-                pass
             txt = "\n\n".join(buf).strip()
             txt = _strip_ctrl(txt)
             if txt and not _is_garbled_text(txt):
@@ -499,8 +1048,7 @@ def extract_pdf_text(
         try:
             min_chars = int((os.environ.get("PDF_TEXT_MIN_CHARS_FOR_NO_OCR") or "800").strip() or "800")
             s0 = (out or "").strip()
-            digit_cnt = sum(1 for ch in s0 if ch.isdigit())
-            too_short = (len(s0) < min_chars) or (digit_cnt < 20)
+            too_short = (len(s0) < min_chars) or (not _has_enough_digits(s0, 20))
         except Exception:
             too_short = False
 
@@ -517,88 +1065,13 @@ def extract_pdf_text(
 
         return _truncate(out)
 
-    # Fast path: try pypdf first to avoid pdfplumber stalls on some PDFs
-    try:
-        from pypdf import PdfReader
-
-        r = PdfReader(str(p))
-        buf: list[str] = []
-        for i in [i for i in page_indices if 0 <= i < len(r.pages)]:
-            try:
-                t = r.pages[i].extract_text() or ""
-                if t:
-                    buf.append(t)
-            except Exception:
-                continue
-        txt = "\n\n".join(buf).strip()
-        txt = _strip_ctrl(txt)
-        if txt and not _is_garbled_text(txt):
-            out = txt
-    except Exception:
-        out = ""
-
-    # 首先尝试 pdfplumber
-    texts: list[str] = []
-    if not out or _is_garbled_text(out):
-        try:
-            import pdfplumber
-            with pdfplumber.open(str(p)) as pdf:
-                for i in [i for i in page_indices if 0 <= i < len(pdf.pages)]:
-                    try:
-                        page = pdf.pages[i]
-                        t = page.extract_text() or ""
-                        if t:
-                            texts.append(t)
-                    except Exception:
-                        continue
-        except Exception:
-            pass
-
-        if texts:
-            out = "\n\n".join(texts).strip()
-            out = _strip_ctrl(out)
-
-    # 如果是乱码/空文本，fallback 到 pdfminer.six（对英文年报常更稳）
-    if not out or _is_garbled_text(out):
-        try:
-            from pdfminer.high_level import extract_text as _pdfminer_extract_text
-
-            # pdfminer 的 page_numbers 是 0-indexed
-            page_numbers = [i for i in page_indices if i >= 0]
-            txt = _pdfminer_extract_text(str(p), page_numbers=page_numbers) or ""
-            txt = txt.strip()
-            if txt and not _is_garbled_text(txt):
-                out = txt
-        except Exception:
-            pass
-
-    # 再 fallback 到 PyMuPDF（fitz）— 对 CID 字体编码的英文年报通常更稳
-    if not out or _is_garbled_text(out):
-        try:
-            import fitz  # PyMuPDF
-
-            doc = fitz.open(str(p))
-            buf: list[str] = []
-            for i in [i for i in page_indices if 0 <= i < int(doc.page_count or 0)]:
-                try:
-                    page = doc.load_page(i)
-                    t = page.get_text("text") or ""
-                    if t:
-                        buf.append(t)
-                except Exception:
-                    continue
-            try:
-                doc.close()
-            except Exception:
-                pass
-            txt = "\n\n".join(buf).strip()
-            if txt and not _is_garbled_text(txt):
-                out = txt
-        except Exception:
-            pass
+    # 纯扫描件（页面没有文本层）：各文本提取器只会白跑一遍，直接走 OCR
+    scanned = _is_scanned_pdf(str(p), page_indices, _fitz_page_text)
+    if scanned:
+        _maybe_debug("pdf_text: no text layer detected; skipping text extractors")
 
-    # 再 fallback 到 pypdf（有时能拿到更干净的文本）
-    if not out or _is_garbled_text(out):
+    # Fast path: try pypdf first to avoid pdfplumber stalls on some PDFs
+    if not scanned:
         try:
             from pypdf import PdfReader
 
@@ -612,11 +1085,55 @@ def extract_pdf_text(
                 except Exception:
                     continue
             txt = "\n\n".join(buf).strip()
+            txt = _strip_ctrl(txt)
             if txt and not _is_garbled_text(txt):
                 out = txt
         except Exception:
-            pass
-    
+            out = ""
+
+    # pypdf 没拿到可用文本时，pdfplumber 放到后台线程，当前线程同时提取 PyMuPDF 文本，
+    # 再按原有优先级（pdfplumber > pdfminer > fitz）取第一个非乱码结果。
+    # pdfminer 最慢，只在 pdfplumber 结果为空/乱码时才跑，避免多余的整份解析。
+    # fitz 文档对象不能跨线程共享，留在当前线程提取。
+    if not scanned and (not out or _is_garbled_text(out)):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            plumber_fut = ex.submit(_pdfplumber_text, str(p), page_indices, max_chars)
+
+            # PyMuPDF（fitz）— 对 CID 字体编码的英文年报通常更稳
+            fitz_txt = ""
+            try:
+                if fitz_doc is None:
+                    raise RuntimeError("fitz_unavailable")
+                buf: list[str] = []
+                for i in [i for i in page_indices if 0 <= i < int(fitz_doc.page_count or 0)]:
+                    try:
+                        t = _fitz_page_text(i)
+                        if t:
+                            buf.append(t)
+                    except Exception:
+                        continue
+                fitz_txt = "\n\n".join(buf).strip()
+            except Exception:
+                fitz_txt = ""
+
+            # 首先是 pdfplumber（即便乱码也先保留，后面的提取器只在拿到非乱码文本时覆盖）
+            plumber_txt = plumber_fut.result()
+        if plumber_txt:
+            out = plumber_txt
+
+        # 如果是乱码/空文本，fallback 到 pdfminer.six（对英文年报常更稳）
+        if not out or _is_garbled_text(out):
+            txt = _pdfminer_text(str(p), page_indices)
+            if txt and not _is_garbled_text(txt):
+                out = txt
+
+        # 再 fallback 到 fitz
+        if not out or _is_garbled_text(out):
+            if fitz_txt and not _is_garbled_text(fitz_txt):
+                out = fitz_txt
+
     # 如果文本是乱码/过短，尝试 OCR
     try:
         min_chars2 = int((os.environ.get("PDF_TEXT_MIN_CHARS_FOR_NO_OCR") or "800").strip() or "800")
@@ -626,8 +1143,7 @@ def extract_pdf_text(
     too_short2 = False
     try:
         s2 = (out or "").strip()
-        digit_cnt2 = sum(1 for ch in s2 if ch.isdigit())
-        too_short2 = (len(s2) < min_chars2) or (digit_cnt2 < 20)
+        too_short2 = (len(s2) < min_chars2) or (not _has_enough_digits(s2, 20))
     except Exception:
         too_short2 = False
 
@@ -1,20 +1,27 @@
 from __future__ import annotations
 
 import json
+import math
 import re
 import time
 import uuid
+from collections import defaultdict
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import pandas as pd
-from sqlalchemy import delete, select
+from sqlalchemy import case, delete, insert, select, update
+from sqlalchemy.orm import Session
 
-from core.a_share import fetch_a_share_financials, row_payload
+from core.a_share import INDUSTRY_KEYS, fetch_a_share_financials, frame_payloads
+from core.akshare_cache import cached
 from core.analysis import STANDARD_ITEM_NAMES, dumps, risk_p0, compute_p0_metrics
 from core.db import session_scope
-from core.models import Alert, ComputedMetric, Report, Statement, StatementItem
+from core.models import Alert, Company, ComputedMetric, Report, Statement, StatementItem
 from core.net import disable_proxies_for_process
 from core.stock_search import normalize_symbol
-from core.repository import upsert_company
+from core.repository import build_company_id
 
 
 PROFIT_MAP = {
@@ -42,37 +49,84 @@ CASH_MAP = {
     "CF.CFO": ("NETCASH_OPERATE", "经营活动现金流净额"),
 }
 
+# 数值解析时删除的非数字字符；日期列名识别用的年份
+_NUM_STRIP_RE = re.compile(r"[^0-9eE.\-+]")
+_YEAR_RE = re.compile(r"\d{4}")
 
-def _period_end_from_row(row: pd.Series) -> str:
-    dt = row.get("REPORT_DATE")
-    if isinstance(dt, pd.Timestamp):
-        return dt.date().isoformat()
-    return str(dt)[:10]
 
+@lru_cache(maxsize=None)
+def _keyword_patterns(keywords: tuple[str, ...]) -> tuple[re.Pattern, tuple[re.Pattern, ...]]:
+    """关键词组编译一次：合并正则（向量化筛行）+ 按优先级排列的单个关键词正则"""
+    combined = re.compile("|".join(f"(?:{kw})" for kw in keywords))
+    return combined, tuple(re.compile(kw) for kw in keywords)
 
-def _safe_float(v) -> float | None:
+
+# 批量 INSERT 每次 execute 的行数（按方言）；超长报表分块写，避免单条语句/参数列表过大
+_INSERT_BATCH_ROWS = {"sqlite": 500, "postgresql": 5000, "mysql": 10000}
+
+
+def _insert_chunked(s: Session, model, rows: list[dict]) -> None:
+    if not rows:
+        return
     try:
-        if v is None:
-            return None
-        if pd.isna(v):
-            return None
-        return float(v)
+        dialect = s.get_bind().dialect.name
     except Exception:
-        return None
+        dialect = ""
+    batch = _INSERT_BATCH_ROWS.get(dialect, 1000)
+    stmt = insert(model)
+    for i in range(0, len(rows), batch):
+        s.execute(stmt, rows[i : i + batch])
 
 
-def delete_report_children_full(report_id: str) -> None:
-    with session_scope() as s:
-        s.execute(delete(Alert).where(Alert.report_id == report_id))
-        s.execute(delete(ComputedMetric).where(ComputedMetric.report_id == report_id))
-        s.execute(delete(StatementItem).where(StatementItem.report_id == report_id))
-        s.execute(delete(Statement).where(Statement.report_id == report_id))
+@lru_cache(maxsize=None)
+def _get_ak():
+    """AkShare 导入很重（加载大量子模块），按需导入一次，模块启动时不拖慢"""
+    import akshare as ak
+
+    return ak
+
+
+# 行业查询共用的后台线程池：接口卡死时等待超时即放弃，卡住的线程数以 max_workers 为上限，
+# 不会随报告数累积（每次新建线程池再 shutdown(wait=False) 会把卡住的线程留在后台）
+_INDUSTRY_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="industry")
+
+
+@lru_cache(maxsize=4096)
+def _industry_for(code: str, day: str) -> str:
+    """A 股代码 -> 所属行业。进程内按 (代码, 日期) 缓存，磁盘上经 akshare_cache 缓存 7 天。
+
+    接口异常、返回空表或没有行业字段时抛异常：lru_cache 不缓存异常，下次调用照常重试。
+    """
+    stock_info = cached(_get_ak().stock_individual_info_em, ttl_days=7.0)(symbol=code)
+    if stock_info is None or stock_info.empty:
+        raise LookupError(f"stock_individual_info_em empty: {code}")
+    info_dict = dict(zip(stock_info["item"], stock_info["value"]))
+    for key in INDUSTRY_KEYS:
+        industry = info_dict.get(key)
+        if industry is not None and str(industry).strip():
+            return str(industry).strip()
+    raise LookupError(f"industry not found: {code}")
+
+
+def delete_report_children_full(report_id: str, session: Session | None = None) -> None:
+    if session is None:
+        with session_scope() as s:
+            delete_report_children_full(report_id, s)
+        return
+    # 子表先删、Statement 最后删（外键顺序）；不做会话内对象同步，省掉删除前的 SELECT
+    for model in (Alert, ComputedMetric, StatementItem, Statement):
+        session.execute(
+            delete(model).where(model.report_id == report_id).execution_options(synchronize_session=False)
+        )
 
 
 def ingest_and_analyze_market_fetch(report_id: str) -> None:
     disable_proxies_for_process()
     with session_scope() as s:
-        r = s.get(Report, report_id)
+        # 只取需要的列，状态用一条 UPDATE 写回，不加载 ORM 实例
+        r = s.execute(
+            select(Report.source_type, Report.company_id, Report.market).where(Report.id == report_id)
+        ).first()
         if not r:
             raise ValueError("report not found")
         if r.source_type != "market_fetch":
@@ -81,9 +135,11 @@ def ingest_and_analyze_market_fetch(report_id: str) -> None:
             raise ValueError("market_fetch report missing company_id")
 
         market = (r.market or "CN").strip().upper()
-        r.status = "running"
-        r.error_message = None
-        r.updated_at = int(time.time())
+        s.execute(
+            update(Report)
+            .where(Report.id == report_id)
+            .values(status="running", error_message=None, updated_at=int(time.time()))
+        )
 
     if market == "CN":
         ingest_and_analyze_a_share(report_id)
@@ -100,7 +156,9 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
     """
     disable_proxies_for_process()
     with session_scope() as s:
-        r = s.get(Report, report_id)
+        r = s.execute(
+            select(Report.company_id, Report.market, Report.period_type, Report.period_end).where(Report.id == report_id)
+        ).first()
         if not r:
             raise ValueError("report not found")
         if not r.company_id:
@@ -114,31 +172,19 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
         symbol = company_id.split(":", 1)[1]
         symbol = normalize_symbol(market, symbol)
 
-    delete_report_children_full(report_id)
-
-    import akshare as ak
-
-    def _num(v):
-        try:
-            if v is None:
-                return None
-            sv = str(v).strip()
-            if sv in ("", "--", "nan", "None"):
-                return None
-            if pd.isna(v):
-                return None
-            return float(v)
-        except Exception:
-            return None
+    ak = _get_ak()
 
     def _to_num(v):
         try:
             if v is None:
                 return None
+            # 表格单元格多半已是数值（含 numpy.float64，它是 float 的子类）：直接返回，NaN 视为缺失
+            if isinstance(v, float):
+                return None if v != v else float(v)
+            if isinstance(v, int):
+                return float(v)
             if pd.isna(v):
                 return None
-            if isinstance(v, (int, float)):
-                return float(v)
 
             sv = str(v).strip()
             if sv in ("", "--", "nan", "None"):
@@ -164,7 +210,7 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
 
             # Remove thousands separators and any stray non-numeric characters
             sv = sv.replace(",", "").replace("，", "").strip()
-            sv = re.sub(r"[^0-9eE.\-+]", "", sv)
+            sv = _NUM_STRIP_RE.sub("", sv)
             if sv in ("", "+", "-", "."):
                 return None
 
@@ -175,109 +221,224 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
         except Exception:
             return None
 
-    def _pick_from_df(df: pd.DataFrame | None, keywords: list[str], *, value_col_candidates: list[str] | None = None) -> float | None:
-        try:
-            if df is None or df.empty:
-                return None
-            item_col = None
-            for c in ("STD_ITEM_NAME", "ITEM_NAME", "项目名称", "项目", "ITEM"):
-                if c in df.columns:
-                    item_col = c
-                    break
-            if not item_col:
-                return None
-            value_col = None
-            for c in (value_col_candidates or ["AMOUNT", "金额", "VALUE", "value"]):
-                if c in df.columns:
-                    value_col = c
-                    break
-            date_col = None
-            for c in ("STD_REPORT_DATE", "REPORT_DATE", "报告期"):
-                if c in df.columns:
-                    date_col = c
-                    break
-            df2 = df
-            if date_col:
+    def _to_num_series(col: pd.Series) -> pd.Series:
+        """_to_num 的整列向量化版本：结果与逐个调用 _to_num 一致，无法解析的为 NaN"""
+        if pd.api.types.is_numeric_dtype(col):
+            return col.astype(float)
+        sv = col.astype(str).str.strip()
+        neg = sv.str.startswith("(") & sv.str.endswith(")")
+        sv = sv.where(~neg, sv.str[1:-1].str.strip())
+        sv = sv.str.replace(r"%$", "", regex=True)
+        # 亿 优先于 万；单位字、千分位逗号等非数字字符统一由下面的正则删除
+        mult = (
+            pd.Series(1.0, index=sv.index)
+            .mask(sv.str.contains("万", regex=False), 1e4)
+            .mask(sv.str.contains("亿", regex=False), 1e8)
+        )
+        sv = sv.str.replace(_NUM_STRIP_RE, "", regex=True)
+        out = pd.to_numeric(sv, errors="coerce") * mult
+        return out.mask(neg, -out)
+
+    # 最新报告期筛选结果：id(df) -> (df, 筛选后的 df)；同一张表只解析一次日期列
+    _latest_rows: dict[int, tuple[pd.DataFrame, pd.DataFrame]] = {}
+
+    def _latest_period_rows(df: pd.DataFrame) -> pd.DataFrame:
+        hit = _latest_rows.get(id(df))
+        if hit is not None and hit[0] is df:
+            return hit[1]
+        df2 = df
+        for date_col in ("STD_REPORT_DATE", "REPORT_DATE", "报告期"):
+            if date_col in df.columns:
                 try:
-                    dt_series = pd.to_datetime(df2[date_col], errors="coerce")
+                    dt_series = pd.to_datetime(df[date_col], errors="coerce")
                     latest_date = dt_series.max()
                     if latest_date is not None and not pd.isna(latest_date):
-                        df2 = df2[dt_series == latest_date]
+                        df2 = df[dt_series == latest_date]
                 except Exception:
                     pass
+                break
+        _latest_rows[id(df)] = (df, df2)
+        return df2
+
+    # 每张报表只做一次列识别、最新报告期筛选和项目名字符串化：(id(df), 金额列候选) -> (df, 准备结果)
+    _pick_prepared: dict[tuple[int, tuple[str, ...] | None], tuple[pd.DataFrame, tuple[pd.DataFrame, pd.Series, str] | None]] = {}
+
+    def _prepare_pick_df(df: pd.DataFrame, value_col_candidates: list[str] | None) -> tuple[pd.DataFrame, pd.Series, str] | None:
+        item_col = None
+        for c in ("STD_ITEM_NAME", "ITEM_NAME", "项目名称", "项目", "ITEM"):
+            if c in df.columns:
+                item_col = c
+                break
+        if not item_col:
+            return None
+        value_col = None
+        for c in (value_col_candidates or ["AMOUNT", "金额", "VALUE", "value"]):
+            if c in df.columns:
+                value_col = c
+                break
+        df2 = _latest_period_rows(df)
+
+        if not value_col:
+            date_like_cols: list[tuple[pd.Timestamp, str]] = []
+            for c in df2.columns:
+                if c == item_col:
+                    continue
+                if isinstance(c, pd.Timestamp):
+                    date_like_cols.append((c, c))
+                    continue
+                sc = str(c)
+                if not _YEAR_RE.search(sc):
+                    continue
+                if "-" not in sc and "/" not in sc:
+                    continue
+                dt = pd.to_datetime(sc, errors="coerce")
+                if dt is None or pd.isna(dt):
+                    continue
+                date_like_cols.append((dt, c))
+            if date_like_cols:
+                date_like_cols.sort(key=lambda x: x[0])
+                value_col = date_like_cols[-1][1]
+        if not value_col:
+            return None
+        return df2, df2[item_col].astype(str), value_col
 
-            if not value_col:
-                date_like_cols: list[tuple[pd.Timestamp, str]] = []
-                for c in df2.columns:
-                    if c == item_col:
-                        continue
-                    if isinstance(c, pd.Timestamp):
-                        date_like_cols.append((c, c))
-                        continue
-                    sc = str(c)
-                    if not re.search(r"\d{4}", sc):
-                        continue
-                    if "-" not in sc and "/" not in sc:
-                        continue
-                    dt = pd.to_datetime(sc, errors="coerce")
-                    if dt is None or pd.isna(dt):
-                        continue
-                    date_like_cols.append((dt, c))
-                if date_like_cols:
-                    date_like_cols.sort(key=lambda x: x[0])
-                    value_col = date_like_cols[-1][1]
-            if not value_col:
+    def _pick_from_df(df: pd.DataFrame | None, keywords: tuple[str, ...], *, value_col_candidates: list[str] | None = None) -> float | None:
+        try:
+            if df is None or df.empty:
                 return None
+            key = (id(df), tuple(value_col_candidates) if value_col_candidates else None)
+            hit = _pick_prepared.get(key)
+            # 缓存里同时持有 df 本身，id 不会被复用；仍校验是同一个对象
+            if hit is None or hit[0] is not df:
+                hit = (df, _prepare_pick_df(df, value_col_candidates))
+                _pick_prepared[key] = hit
+            prepared = hit[1]
+            if prepared is None:
+                return None
+            df2, names, value_col = prepared
 
-            for kw in keywords:
-                hit = df2[df2[item_col].astype(str).str.contains(kw, na=False)]
-                if not hit.empty:
-                    return _to_num(hit.iloc[0].get(value_col))
+            # 用一个合并正则做一次向量化扫描，筛出命中任一关键词的行；
+            # 再在这几行里按关键词优先级、行序取第一个（与逐个关键词扫整列的结果一致）
+            if not keywords:
+                return None
+            combined_re, keyword_res = _keyword_patterns(tuple(keywords))
+            mask = names.str.contains(combined_re, na=False)
+            hit_pos = mask.to_numpy().nonzero()[0]
+            if len(hit_pos) == 0:
+                return None
+            hit_names = [(int(i), names.iat[int(i)]) for i in hit_pos]
+            for kw_re in keyword_res:
+                for i, name in hit_names:
+                    if kw_re.search(name):
+                        # 只取金额列的单元格，不为整行构造 Series
+                        return _to_num(df2[value_col].iat[i])
             return None
         except Exception:
             return None
 
-    def _ingest_items(*, statement_type: str, period_end: str, items: dict[str, float | None], currency: str | None = None):
-        with session_scope() as s:
-            st_obj = Statement(
-                id=str(uuid.uuid4()),
-                report_id=report_id,
-                company_id=company_id,
-                statement_type=statement_type,
-                period_end=period_end,
-                period_type=period_type,
-                source="akshare",
-                raw_payload=dumps({"items": items, "currency": currency}),
-                created_at=int(time.time()),
+    def _ingest_items(
+        s: Session, *, statement_type: str, period_end: str, items: dict[str, float | None], now_ts: int, currency: str | None = None
+    ):
+        statement_id = str(uuid.uuid4())
+        # 报表行一次性批量 INSERT（Core insert + 参数列表），不逐个走 ORM 单元工作
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "statement_id": statement_id,
+                "report_id": report_id,
+                "company_id": company_id,
+                "statement_type": statement_type,
+                "period_end": period_end,
+                "period_type": period_type,
+                "standard_item_code": code,
+                "standard_item_name": STANDARD_ITEM_NAMES.get(code, code),
+                "value": v,
+                "currency": currency,
+                "original_item_name": None,
+                "mapping_confidence": None,
+            }
+            for code, v in items.items()
+        ]
+        s.execute(
+            insert(Statement),
+            [
+                {
+                    "id": statement_id,
+                    "report_id": report_id,
+                    "company_id": company_id,
+                    "statement_type": statement_type,
+                    "period_end": period_end,
+                    "period_type": period_type,
+                    "source": "akshare",
+                    "raw_payload": dumps({"items": items, "currency": currency}),
+                    "created_at": now_ts,
+                }
+            ],
+        )
+        if rows:
+            s.execute(insert(StatementItem), rows)
+
+    def _write_metric_overrides(
+        s: Session, *, period_end: str, overrides: list[tuple[str, str, float | None, str | None]], now_ts: int
+    ):
+        # 用指标接口的值覆盖同名指标：一条 DELETE 删掉旧值，再一条批量 INSERT 写入
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "report_id": report_id,
+                "company_id": company_id,
+                "period_end": period_end,
+                "period_type": period_type,
+                "metric_code": code2,
+                "metric_name": name2,
+                "value": float(val2),
+                "unit": unit2,
+                "created_at": now_ts,
+            }
+            for code2, name2, val2, unit2 in overrides
+            if val2 is not None
+        ]
+        if not rows:
+            return
+        s.execute(
+            delete(ComputedMetric)
+            .where(
+                ComputedMetric.report_id == report_id,
+                ComputedMetric.period_end == period_end,
+                ComputedMetric.metric_code.in_([r["metric_code"] for r in rows]),
             )
-            s.add(st_obj)
-            for code, v in items.items():
-                s.add(
-                    StatementItem(
-                        id=str(uuid.uuid4()),
-                        statement_id=st_obj.id,
-                        report_id=report_id,
-                        company_id=company_id,
-                        statement_type=statement_type,
-                        period_end=period_end,
-                        period_type=period_type,
-                        standard_item_code=code,
-                        standard_item_name=STANDARD_ITEM_NAMES.get(code, code),
-                        value=v,
-                        currency=currency,
-                        original_item_name=None,
-                        mapping_confidence=None,
-                    )
-                )
+            .execution_options(synchronize_session=False)
+        )
+        s.execute(insert(ComputedMetric), rows)
+
+    # 各市场分支只负责取数和算值，写库统一放到最后的一个事务里
+    # （网络请求期间不占用数据库事务）
+    statements: list[tuple[str, dict[str, float | None]]] = []
+    overrides: list[tuple[str, str, float | None, str | None]] = []
 
     if market == "HK":
         code = symbol.replace(".HK", "")
         code = code.zfill(5)
-        ind_df = None
-        try:
-            ind_df = ak.stock_hk_financial_indicator_em(symbol=code)
-        except Exception:
-            ind_df = None
+
+        def _fetch_or_none(fn, **kwargs):
+            try:
+                return fn(**kwargs)
+            except Exception:
+                return None
+
+        hk_indicator = cached(ak.stock_hk_financial_indicator_em)
+        hk_report = cached(ak.stock_financial_hk_report_em)
+
+        # 四个接口互不依赖，都是阻塞的网络请求：并发发出，总耗时约为最慢的一个
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            ind_fut = ex.submit(_fetch_or_none, hk_indicator, symbol=code)
+            profit_fut = ex.submit(_fetch_or_none, hk_report, stock=code, symbol="利润表", indicator="年度")
+            balance_fut = ex.submit(_fetch_or_none, hk_report, stock=code, symbol="资产负债表", indicator="年度")
+            cash_fut = ex.submit(_fetch_or_none, hk_report, stock=code, symbol="现金流量表", indicator="年度")
+        ind_df = ind_fut.result()
+        profit_df = profit_fut.result()
+        balance_df = balance_fut.result()
+        cash_df = cash_fut.result()
 
         revenue = None
         net_profit = None
@@ -326,25 +487,9 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
         except Exception:
             pass
 
-        profit_df = None
-        balance_df = None
-        cash_df = None
-        try:
-            profit_df = ak.stock_financial_hk_report_em(stock=code, symbol="利润表", indicator="年度")
-        except Exception:
-            profit_df = None
-        try:
-            balance_df = ak.stock_financial_hk_report_em(stock=code, symbol="资产负债表", indicator="年度")
-        except Exception:
-            balance_df = None
-        try:
-            cash_df = ak.stock_financial_hk_report_em(stock=code, symbol="现金流量表", indicator="年度")
-        except Exception:
-            cash_df = None
-
         revenue_stmt = _pick_from_df(
             profit_df,
-            [
+            (
                 "营业额",
                 "营业收入",
                 "营运收入",
@@ -358,7 +503,7 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
                 "Total revenues",
                 "Total income",
                 "Net revenue",
-            ],
+            ),
         )
         if revenue is None:
             revenue = revenue_stmt
@@ -375,7 +520,7 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
         if net_profit is None:
             net_profit = _pick_from_df(
                 profit_df,
-                [
+                (
                     "净利润",
                     "净利",
                     "本年溢利",
@@ -385,10 +530,10 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
                     "Net profit",
                     "Profit for the year",
                     "Profit attributable",
-                ],
+                ),
             )
 
-        gross_profit = _pick_from_df(profit_df, ["毛利", "毛利润", "Gross profit"])
+        gross_profit = _pick_from_df(profit_df, ("毛利", "毛利润", "Gross profit"))
 
         # COGS selection for HK is tricky: generic keyword "成本" often matches non-COGS items
         # (e.g., finance cost), resulting in unrealistically high gross margin (97%+).
@@ -406,7 +551,7 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
             # Prefer explicit cost-of-sales / cost-of-revenue keywords.
             cogs = _pick_from_df(
                 profit_df,
-                [
+                (
                     "销售成本",
                     "营业成本",
                     "营运成本",
@@ -419,7 +564,7 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
                     "Cost of revenues",
                     "Cost of goods sold",
                     "Cost of sales and services",
-                ],
+                ),
             )
 
         if cogs is None and profit_df is not None and not profit_df.empty and revenue is not None:
@@ -436,20 +581,8 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
                     if c in df_cost.columns:
                         value_col = c
                         break
-                date_col = None
-                for c in ("STD_REPORT_DATE", "REPORT_DATE", "报告期"):
-                    if c in df_cost.columns:
-                        date_col = c
-                        break
                 if item_col and value_col:
-                    if date_col:
-                        try:
-                            dt_series = pd.to_datetime(df_cost[date_col], errors="coerce")
-                            latest_date = dt_series.max()
-                            if latest_date is not None and not pd.isna(latest_date):
-                                df_cost = df_cost[dt_series == latest_date]
-                        except Exception:
-                            pass
+                    df_cost = _latest_period_rows(df_cost)
 
                     rp = float(revenue)
                     excludes = [
@@ -480,38 +613,18 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
                         "amortization",
                     ]
 
-                    candidates: list[float] = []
-                    for _, rr in df_cost.iterrows():
-                        name = str(rr.get(item_col) or "").strip()
-                        low = name.lower()
-                        is_cost_like = ("成本" in name) or ("cost" in low) or ("cogs" in low)
-                        if not is_cost_like:
-                            continue
-                        if any(x in name for x in excludes):
-                            continue
-                        if any(x in low for x in excludes):
-                            continue
-                        try:
-                            v = rr.get(value_col)
-                            fv = _to_num(v)
-                        except Exception:
-                            continue
-                        if fv is None:
-                            continue
-                        if fv <= 0:
-                            continue
-                        # choose values that yield a reasonable gross margin.
-                        gm = None
-                        try:
-                            gm = (rp - fv) / rp * 100.0
-                        except Exception:
-                            gm = None
-                        if gm is not None and 0.0 <= gm <= 80.0:
-                            candidates.append(fv)
-
-                    if candidates:
+                    # 整列布尔掩码一次筛选（不逐行 iterrows）：
+                    # 名称像成本、不含排除词、金额为正且推出的毛利率在 0~80% 之间。
+                    # 排除词都是小写英文或中文，对小写后的名称匹配即可。
+                    low = df_cost[item_col].fillna("").astype(str).str.strip().str.lower()
+                    is_cost_like = low.str.contains("成本|cost|cogs", regex=True)
+                    is_excluded = low.str.contains("|".join(map(re.escape, excludes)), regex=True)
+                    values = _to_num_series(df_cost[value_col])
+                    gm = (rp - values) / rp * 100.0
+                    mask = is_cost_like & ~is_excluded & (values > 0) & gm.between(0.0, 80.0)
+                    if mask.any():
                         # pick the largest plausible COGS among candidates
-                        cogs = max(candidates)
+                        cogs = float(values[mask].max())
 
             except Exception:
                 cogs = None
@@ -537,9 +650,9 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
             except Exception:
                 pass
 
-        total_assets = _pick_from_df(balance_df, ["资产总值", "资产总计", "总资产", "资产合计"])
-        total_liab = _pick_from_df(balance_df, ["负债总额", "负债合计", "总负债"])
-        total_equity = _pick_from_df(balance_df, ["权益总额", "权益总计", "股东权益合计", "股东应占权益", "权益"])
+        total_assets = _pick_from_df(balance_df, ("资产总值", "资产总计", "总资产", "资产合计"))
+        total_liab = _pick_from_df(balance_df, ("负债总额", "负债合计", "总负债"))
+        total_equity = _pick_from_df(balance_df, ("权益总额", "权益总计", "股东权益合计", "股东应占权益", "权益"))
 
         try:
             if total_assets is not None and total_liab is not None:
@@ -555,21 +668,20 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
                                 total_equity = derived_equity
         except Exception:
             pass
-        ca_total = _pick_from_df(balance_df, ["流动资产总值", "流动资产合计", "流动资产"])
-        cl_total = _pick_from_df(balance_df, ["流动负债总额", "流动负债合计", "流动负债"])
-        inventory = _pick_from_df(balance_df, ["存货"])
-        ar = _pick_from_df(balance_df, ["应收账款", "应收账项"])
-        cash = _pick_from_df(balance_df, ["现金", "货币资金", "现金及现金等价物", "银行结余"])
+        ca_total = _pick_from_df(balance_df, ("流动资产总值", "流动资产合计", "流动资产"))
+        cl_total = _pick_from_df(balance_df, ("流动负债总额", "流动负债合计", "流动负债"))
+        inventory = _pick_from_df(balance_df, ("存货",))
+        ar = _pick_from_df(balance_df, ("应收账款", "应收账项"))
+        cash = _pick_from_df(balance_df, ("现金", "货币资金", "现金及现金等价物", "银行结余"))
 
-        cfo = _pick_from_df(cash_df, ["经营活动现金流量净额", "经营活动现金流净额", "经营活动现金净额"])
+        cfo = _pick_from_df(cash_df, ("经营活动现金流量净额", "经营活动现金流净额", "经营活动现金净额"))
 
-        pe = period_end
-        _ingest_items(statement_type="is", period_end=pe, items={
+        statements.append(("is", {
             "IS.REVENUE": revenue,
             "IS.COGS": cogs,
             "IS.NET_PROFIT": net_profit,
-        })
-        _ingest_items(statement_type="bs", period_end=pe, items={
+        }))
+        statements.append(("bs", {
             "BS.CASH": cash,
             "BS.AR": ar,
             "BS.INVENTORY": inventory,
@@ -578,12 +690,10 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
             "BS.ASSET_TOTAL": total_assets,
             "BS.LIAB_TOTAL": total_liab,
             "BS.EQUITY_TOTAL": total_equity,
-        })
-        _ingest_items(statement_type="cf", period_end=pe, items={
+        }))
+        statements.append(("cf", {
             "CF.CFO": cfo,
-        })
-
-        _compute_metrics_and_alerts(report_id, company_id, focus_period_end=pe, period_type=period_type)
+        }))
 
         # Override key ratios using indicator table (more reliable than inferred revenue/cogs)
         def _reasonable_pct(v: float | None) -> float | None:
@@ -620,7 +730,7 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
             except Exception:
                 return None
 
-        overrides: list[tuple[str, str, float | None, str | None]] = [
+        overrides = [
             ("GROSS_MARGIN", "毛利率", _reasonable_gross_margin_hk(gross_margin_pct), "%"),
             ("NET_MARGIN", "净利率", _reasonable_pct(net_profit_margin), "%"),
             ("ROE", "ROE", _reasonable_pct(roe_pct), "%"),
@@ -630,37 +740,11 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
             ("QUICK_RATIO", "速动比率", _reasonable_times(quick_ratio), "times"),
         ]
 
-        with session_scope() as s:
-            for code2, name2, val2, unit2 in overrides:
-                if val2 is None:
-                    continue
-                s.execute(
-                    delete(ComputedMetric).where(
-                        ComputedMetric.report_id == report_id,
-                        ComputedMetric.period_end == pe,
-                        ComputedMetric.metric_code == code2,
-                    )
-                )
-                s.add(
-                    ComputedMetric(
-                        id=str(uuid.uuid4()),
-                        report_id=report_id,
-                        company_id=company_id,
-                        period_end=pe,
-                        period_type=period_type,
-                        metric_code=code2,
-                        metric_name=name2,
-                        value=float(val2),
-                        unit=unit2,
-                        created_at=int(time.time()),
-                    )
-                )
-
     elif market == "US":
         base = symbol.split(".", 1)[0]
         ind_df = None
         try:
-            ind_df = ak.stock_financial_us_analysis_indicator_em(symbol=base, indicator="年报")
+            ind_df = cached(ak.stock_financial_us_analysis_indicator_em)(symbol=base, indicator="年报")
         except Exception:
             ind_df = None
 
@@ -701,25 +785,22 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
         except Exception:
             pass
 
-        pe = period_end
-        _ingest_items(statement_type="is", period_end=pe, items={
+        statements.append(("is", {
             "IS.REVENUE": revenue,
             "IS.COGS": cogs,
             "IS.NET_PROFIT": net_profit,
-        })
-        _ingest_items(statement_type="bs", period_end=pe, items={
+        }))
+        statements.append(("bs", {
             "BS.CASH": cash,
             "BS.CA_TOTAL": ca_total,
             "BS.CL_TOTAL": cl_total,
             "BS.ASSET_TOTAL": total_assets,
             "BS.LIAB_TOTAL": total_liab,
             "BS.EQUITY_TOTAL": total_equity,
-        })
-        _ingest_items(statement_type="cf", period_end=pe, items={
+        }))
+        statements.append(("cf", {
             "CF.CFO": cfo,
-        })
-
-        _compute_metrics_and_alerts(report_id, company_id, focus_period_end=pe, period_type=period_type)
+        }))
 
         def _reasonable_pct(v: float | None) -> float | None:
             try:
@@ -743,7 +824,7 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
             except Exception:
                 return None
 
-        overrides: list[tuple[str, str, float | None, str | None]] = [
+        overrides = [
             ("GROSS_MARGIN", "毛利率", _reasonable_pct(gross_margin_pct), "%"),
             ("NET_MARGIN", "净利率", _reasonable_pct(net_margin_pct), "%"),
             ("ROE", "ROE", _reasonable_pct(roe_pct), "%"),
@@ -753,51 +834,38 @@ def _ingest_and_analyze_non_cn_akshare(report_id: str) -> None:
             ("QUICK_RATIO", "速动比率", _reasonable_times(quick_ratio), "times"),
         ]
 
-        with session_scope() as s:
-            for code2, name2, val2, unit2 in overrides:
-                if val2 is None:
-                    continue
-                s.execute(
-                    delete(ComputedMetric).where(
-                        ComputedMetric.report_id == report_id,
-                        ComputedMetric.period_end == pe,
-                        ComputedMetric.metric_code == code2,
-                    )
-                )
-                s.add(
-                    ComputedMetric(
-                        id=str(uuid.uuid4()),
-                        report_id=report_id,
-                        company_id=company_id,
-                        period_end=pe,
-                        period_type=period_type,
-                        metric_code=code2,
-                        metric_name=name2,
-                        value=float(val2),
-                        unit=unit2,
-                        created_at=int(time.time()),
-                    )
-                )
-
+    # 本次写入的所有行共用一个时间戳
+    now_ts = int(time.time())
     with session_scope() as s:
-        rr = s.get(Report, report_id)
-        if not rr:
-            return
-        # computed metrics for this report determine status
-        has_metrics = (s.execute(select(ComputedMetric.id).where(ComputedMetric.report_id == report_id)).first() is not None)
-        if has_metrics:
-            rr.status = "done"
-            rr.error_message = None
-        else:
-            rr.status = "failed"
-            rr.error_message = "未能从市场数据获取到可用的财务指标（HK/US）"
-        rr.updated_at = int(time.time())
+        delete_report_children_full(report_id, s)
+        for statement_type, items in statements:
+            _ingest_items(s, statement_type=statement_type, period_end=period_end, items=items, now_ts=now_ts)
+        if statements:
+            _compute_metrics_and_alerts(
+                report_id, company_id, focus_period_end=period_end, period_type=period_type, session=s, now_ts=now_ts
+            )
+        _write_metric_overrides(s, period_end=period_end, overrides=overrides, now_ts=now_ts)
+        s.flush()
+
+        # computed metrics for this report determine status：一条 UPDATE + EXISTS 子查询完成
+        has_metrics = select(ComputedMetric.id).where(ComputedMetric.report_id == report_id).exists()
+        s.execute(
+            update(Report)
+            .where(Report.id == report_id)
+            .values(
+                status=case((has_metrics, "done"), else_="failed"),
+                error_message=case((has_metrics, None), else_="未能从市场数据获取到可用的财务指标（HK/US）"),
+                updated_at=now_ts,
+            )
+        )
 
 
 def ingest_and_analyze_a_share(report_id: str) -> None:
     disable_proxies_for_process()
     with session_scope() as s:
-        r = s.get(Report, report_id)
+        r = s.execute(
+            select(Report.company_id, Report.period_type, Report.period_end).where(Report.id == report_id)
+        ).first()
         if not r:
             raise ValueError("report not found")
         if not r.company_id:
@@ -810,64 +878,72 @@ def ingest_and_analyze_a_share(report_id: str) -> None:
         symbol = company_id.split(":", 1)[1]
         symbol = normalize_symbol("CN", symbol)
 
-        r.status = "running"
-        r.error_message = None
-        r.updated_at = int(time.time())
-
-    delete_report_children_full(report_id)
+        s.execute(
+            update(Report)
+            .where(Report.id == report_id)
+            .values(status="running", error_message=None, updated_at=int(time.time()))
+        )
 
+    # 行业信息（用于行业基准对比）只依赖股票代码：与三张报表的拉取并发进行。
+    # _industry_for 经磁盘缓存 7 天，近期查过的代码不会真正请求接口
+    industry = None
+    industry_fut = _INDUSTRY_EXECUTOR.submit(_industry_for, symbol.split(".")[0], date.today().isoformat())
     fin = fetch_a_share_financials(symbol)
-
-    # 补齐行业信息（用于行业基准对比）
     try:
-        import akshare as ak
-
-        code = symbol.split(".")[0]
-        stock_info = ak.stock_individual_info_em(symbol=code)
-        if stock_info is not None and not stock_info.empty:
-            info_dict = dict(zip(stock_info["item"], stock_info["value"]))
-            industry = (
-                info_dict.get("所属行业")
-                or info_dict.get("行业")
-                or info_dict.get("所属板块")
-                or info_dict.get("行业分类")
-            )
-            industry = (str(industry).strip() if industry is not None else None) or None
-
-            if industry:
-                # 同步到公司表
-                try:
-                    upsert_company(market="CN", symbol=symbol, industry_code=industry)
-                except Exception:
-                    pass
-
-                # 写入报告 source_meta
-                with session_scope() as s2:
-                    rr = s2.get(Report, report_id)
-                    if rr:
-                        try:
-                            meta = json.loads(rr.source_meta or "{}")
-                        except Exception:
-                            meta = {}
-                        meta["industry"] = industry
-                        if "industry_bucket" not in meta:
-                            meta["industry_bucket"] = None
-                        rr.source_meta = json.dumps(meta, ensure_ascii=False)
-                        rr.updated_at = int(time.time())
+        industry = industry_fut.result(timeout=10)
     except Exception:
         pass
 
-    _ingest_statement(report_id, company_id, "is", period_type, fin.profit, PROFIT_MAP, source="akshare_em")
-    _ingest_statement(report_id, company_id, "bs", period_type, fin.balance, BALANCE_MAP, source="akshare_em")
-    _ingest_statement(report_id, company_id, "cf", period_type, fin.cash, CASH_MAP, source="akshare_em")
+    # 三张报表与指标/预警共用一个入库时间戳；删旧数据、写新数据、公司行业、报告状态都在同一个事务里
+    now_ts = int(time.time())
+    with session_scope() as s:
+        delete_report_children_full(report_id, s)
+        for statement_type, df, mapping in (
+            ("is", fin.profit, PROFIT_MAP),
+            ("bs", fin.balance, BALANCE_MAP),
+            ("cf", fin.cash, CASH_MAP),
+        ):
+            _ingest_statement(
+                report_id, company_id, statement_type, period_type, df, mapping, source="akshare_em", now_ts=now_ts, session=s
+            )
+
+        _compute_metrics_and_alerts(
+            report_id, company_id, focus_period_end=period_end, period_type=period_type, session=s, now_ts=now_ts
+        )
 
-    _compute_metrics_and_alerts(report_id, company_id, focus_period_end=period_end, period_type=period_type)
+        if industry:
+            # 同步到公司表
+            cid = build_company_id("CN", symbol)
+            res = s.execute(
+                update(Company).where(Company.id == cid).values(industry_code=industry, updated_at=now_ts)
+            )
+            if not res.rowcount:
+                s.add(
+                    Company(
+                        id=cid,
+                        market="CN",
+                        symbol=symbol,
+                        industry_code=industry,
+                        created_at=now_ts,
+                        updated_at=now_ts,
+                    )
+                )
 
-    with session_scope() as s:
-        r2 = s.get(Report, report_id)
-        if r2:
-            r2.status = "done"
-            r2.updated_at = int(time.time())
+        values: dict = {"status": "done", "updated_at": now_ts}
+        if industry:
+            # 写入报告 source_meta
+            meta_raw = s.execute(select(Report.source_meta).where(Report.id == report_id)).scalar()
+            try:
+                meta = json.loads(meta_raw or "{}")
+            except Exception:
+                meta = {}
+            if not isinstance(meta, dict):
+                meta = {}
+            meta["industry"] = industry
+            if "industry_bucket" not in meta:
+                meta["industry_bucket"] = None
+            values["source_meta"] = json.dumps(meta, ensure_ascii=False)
+        s.execute(update(Report).where(Report.id == report_id).values(**values))
 
 
 def _ingest_statement(
@@ -878,109 +954,181 @@ def _ingest_statement(
     df: pd.DataFrame,
     mapping: dict[str, tuple[str | None, str]],
     source: str,
+    now_ts: int | None = None,
+    session: Session | None = None,
 ) -> None:
     keep_cols = ["REPORT_DATE", "CURRENCY"] + [c for c, _ in mapping.values() if c]
 
-    with session_scope() as s:
-        for _, row in df.iterrows():
-            period_end = _period_end_from_row(row)
-            currency = str(row.get("CURRENCY")) if row.get("CURRENCY") is not None else None
-
-            st_obj = Statement(
-                id=str(uuid.uuid4()),
-                report_id=report_id,
-                company_id=company_id,
-                statement_type=statement_type,
-                period_end=period_end,
-                period_type=period_type,
-                source=source,
-                raw_payload=row_payload(row, keep_cols),
-                created_at=int(time.time()),
-            )
-            s.add(st_obj)
-
-            for code, (col, name) in mapping.items():
-                if col is None:
-                    # placeholder for fields not mapped in P0
-                    continue
-                v = _safe_float(row.get(col))
-                item = StatementItem(
-                    id=str(uuid.uuid4()),
-                    statement_id=st_obj.id,
-                    report_id=report_id,
-                    company_id=company_id,
-                    statement_type=statement_type,
-                    period_end=period_end,
-                    period_type=period_type,
-                    standard_item_code=code,
-                    standard_item_name=STANDARD_ITEM_NAMES.get(code, name),
-                    value=v,
-                    currency=currency,
-                    original_item_name=col,
-                    mapping_confidence=1.0,
-                )
-                s.add(item)
-
+    if now_ts is None:
+        now_ts = int(time.time())
+    # 按列整体取值（日期、币种、各科目数值一次转换），再逐行拼出两张表的行，最后各一次批量 INSERT
+    n = len(df)
+    dates = df["REPORT_DATE"].tolist() if "REPORT_DATE" in df.columns else [None] * n
+    period_ends = [d.date().isoformat() if isinstance(d, pd.Timestamp) else str(d)[:10] for d in dates]
+    currencies = (
+        [None if c is None else str(c) for c in df["CURRENCY"].tolist()] if "CURRENCY" in df.columns else [None] * n
+    )
+    payloads = frame_payloads(df, keep_cols)
+    value_lists: list[tuple[str, str, str, list[float | None]]] = []
+    for code, (col, name) in mapping.items():
+        if col is None:
+            # placeholder for fields not mapped in P0
+            continue
+        if col in df.columns:
+            # 整列一次转 float64（无法解析的为 NaN），逐格只剩一次 isnan 判断
+            vals = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float, na_value=math.nan)
+            values = [None if math.isnan(v) else v for v in vals.tolist()]
+        else:
+            values = [None] * n
+        value_lists.append((code, STANDARD_ITEM_NAMES.get(code, name), col, values))
+
+    stmt_rows: list[dict] = []
+    item_rows: list[dict] = []
+    for i in range(n):
+        period_end = period_ends[i]
+        currency = currencies[i]
+        statement_id = str(uuid.uuid4())
+
+        stmt_rows.append(
+            {
+                "id": statement_id,
+                "report_id": report_id,
+                "company_id": company_id,
+                "statement_type": statement_type,
+                "period_end": period_end,
+                "period_type": period_type,
+                "source": source,
+                "raw_payload": payloads[i],
+                "created_at": now_ts,
+            }
+        )
 
-def _items_for_period(report_id: str, period_end: str) -> dict[str, float | None]:
-    with session_scope() as s:
-        stmt = select(StatementItem).where(StatementItem.report_id == report_id, StatementItem.period_end == period_end)
-        items = s.execute(stmt).scalars().all()
-        return {i.standard_item_code: i.value for i in items}
+        for code, item_name, col, values in value_lists:
+            item_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "statement_id": statement_id,
+                    "report_id": report_id,
+                    "company_id": company_id,
+                    "statement_type": statement_type,
+                    "period_end": period_end,
+                    "period_type": period_type,
+                    "standard_item_code": code,
+                    "standard_item_name": item_name,
+                    "value": values[i],
+                    "currency": currency,
+                    "original_item_name": col,
+                    "mapping_confidence": 1.0,
+                }
+            )
 
+    if not stmt_rows:
+        return
+    if session is None:
+        with session_scope() as s:
+            _insert_chunked(s, Statement, stmt_rows)
+            _insert_chunked(s, StatementItem, item_rows)
+        return
+    _insert_chunked(session, Statement, stmt_rows)
+    _insert_chunked(session, StatementItem, item_rows)
 
-def _sorted_periods(report_id: str) -> list[str]:
-    with session_scope() as s:
-        stmt = select(Statement.period_end).where(Statement.report_id == report_id).distinct()
-        periods = sorted({p[0] for p in s.execute(stmt).all()})
-        return periods
 
+def _items_by_period(report_id: str, session: Session | None = None) -> dict[str, dict[str, float | None]]:
+    """一次查询取出报告全部科目，按期间分组：{period_end: {standard_item_code: value}}"""
+    if session is None:
+        with session_scope() as s:
+            return _items_by_period(report_id, s)
+    stmt = select(StatementItem.period_end, StatementItem.standard_item_code, StatementItem.value).where(
+        StatementItem.report_id == report_id
+    )
+    by_period: dict[str, dict[str, float | None]] = defaultdict(dict)
+    for pe, code, value in session.execute(stmt):
+        by_period[pe][code] = value
+    return by_period
+
+
+def _sorted_periods(report_id: str, session: Session | None = None) -> list[str]:
+    if session is None:
+        with session_scope() as s:
+            return _sorted_periods(report_id, s)
+    # 期间为 YYYY-MM-DD 字符串，交给数据库去重排序（走 (report_id, period_end) 索引）
+    stmt = (
+        select(Statement.period_end)
+        .where(Statement.report_id == report_id)
+        .distinct()
+        .order_by(Statement.period_end)
+    )
+    return list(session.execute(stmt).scalars())
+
+
+def _compute_metrics_and_alerts(
+    report_id: str,
+    company_id: str,
+    focus_period_end: str,
+    period_type: str,
+    session: Session | None = None,
+    now_ts: int | None = None,
+) -> None:
+    """计算各期指标与重点期预警。传入 session 时在调用方的事务内完成（不单独提交）。"""
+    if session is None:
+        with session_scope() as s:
+            _compute_metrics_and_alerts(report_id, company_id, focus_period_end, period_type, s, now_ts)
+        return
+    if now_ts is None:
+        now_ts = int(time.time())
 
-def _compute_metrics_and_alerts(report_id: str, company_id: str, focus_period_end: str, period_type: str) -> None:
-    periods = _sorted_periods(report_id)
+    s = session
+    s.flush()
+    periods = _sorted_periods(report_id, s)
     if not periods:
         return
+    by_period = _items_by_period(report_id, s)
 
     # compute metrics for all periods with prev period for avg fields
-    with session_scope() as s:
-        for idx, pe in enumerate(periods):
-            cur_items = _items_for_period(report_id, pe)
-            prev_items = _items_for_period(report_id, periods[idx - 1]) if idx > 0 else None
-            metrics = compute_p0_metrics(cur_items, prev_items)
-            for m in metrics:
-                s.add(
-                    ComputedMetric(
-                        id=str(uuid.uuid4()),
-                        report_id=report_id,
-                        company_id=company_id,
-                        period_end=pe,
-                        period_type=period_type,
-                        metric_code=m.metric_code,
-                        metric_name=m.metric_name,
-                        value=m.value,
-                        unit=m.unit,
-                        calc_trace=dumps(m.calc_trace),
-                        created_at=int(time.time()),
-                    )
-                )
+    metric_rows: list[dict] = []
+    for idx, pe in enumerate(periods):
+        cur_items = by_period.get(pe, {})
+        prev_items = by_period.get(periods[idx - 1], {}) if idx > 0 else None
+        metrics = compute_p0_metrics(cur_items, prev_items)
+        for m in metrics:
+            metric_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "report_id": report_id,
+                    "company_id": company_id,
+                    "period_end": pe,
+                    "period_type": period_type,
+                    "metric_code": m.metric_code,
+                    "metric_name": m.metric_name,
+                    "value": m.value,
+                    "unit": m.unit,
+                    "calc_trace": dumps(m.calc_trace),
+                    "created_at": now_ts,
+                }
+            )
+    _insert_chunked(s, ComputedMetric, metric_rows)
 
     # alerts only for focus period (latest selected)
-    focus_items = _items_for_period(report_id, focus_period_end)
+    focus_items = by_period.get(focus_period_end, {})
     alerts = risk_p0(focus_items)
-    with session_scope() as s:
-        for a in alerts:
-            s.add(
-                Alert(
-                    id=str(uuid.uuid4()),
-                    report_id=report_id,
-                    company_id=company_id,
-                    period_end=focus_period_end,
-                    period_type=period_type,
-                    alert_code=a.alert_code,
-                    level=a.level,
-                    title=a.title,
-                    message=a.message,
-                    evidence=dumps(a.evidence),
-                    created_at=int(time.time()),
-                )
-            )
+    _insert_chunked(
+        s,
+        Alert,
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "report_id": report_id,
+                "company_id": company_id,
+                "period_end": focus_period_end,
+                "period_type": period_type,
+                "alert_code": a.alert_code,
+                "level": a.level,
+                "title": a.title,
+                "message": a.message,
+                "evidence": dumps(a.evidence),
+                "created_at": now_ts,
+            }
+            for a in alerts
+        ],
+    )
+    s.flush()
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 from core.db import _engine
-from core.models import Base
+from core.models import Base, Statement, StatementItem
 
 
 def init_db() -> None:
     Base.metadata.create_all(bind=_engine)
+    # create_all 不会给已存在的表补建索引：后加的组合索引单独按需创建
+    for model in (Statement, StatementItem):
+        for idx in model.__table__.indexes:
+            if len(idx.columns) > 1:
+                idx.create(bind=_engine, checkfirst=True)
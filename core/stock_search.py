@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
+
+import pandas as pd
 
 try:
     import streamlit as st
@@ -14,8 +18,16 @@ except Exception:  # pragma: no cover
 
             return _decorator
 
+        @staticmethod
+        def cache_resource(ttl: int | None = None):
+            def _decorator(fn):
+                return fn
+
+            return _decorator
+
     st = _NoStreamlit()  # type: ignore
 
+from core.akshare_cache import cached
 from core.net import disable_proxies_for_process
 
 
@@ -27,69 +39,97 @@ class StockCandidate:
 
 
 _A_CN_SUFFIX_RE = re.compile(r"^(\d{6})\.(SH|SZ|BJ)$", re.IGNORECASE)
-
-
+_CN_6_RE = re.compile(r"\d{6}")
+_HK_RE = re.compile(r"\d{1,5}(\.HK)?")
+_US_RE = re.compile(r"[A-Z.\-]{1,10}")
+
+_MARKET_ALIASES = {
+    "A股": "CN",
+    "CN": "CN",
+    "A": "CN",
+    "港股": "HK",
+    "HK": "HK",
+    "美股": "US",
+    "US": "US",
+}
+
+
+@lru_cache(maxsize=4096)
 def _normalize_market(market: str) -> str:
     m = (market or "").strip().upper()
-    if m in {"A股", "CN", "A"}:
-        return "CN"
-    if m in {"港股", "HK"}:
-        return "HK"
-    if m in {"美股", "US"}:
-        return "US"
-    return m or "CN"
+    return _MARKET_ALIASES.get(m) or m or "CN"
+
 
+def _normalize_cn(s: str) -> str:
+    m = _A_CN_SUFFIX_RE.match(s)
+    if m:
+        return f"{m.group(1)}.{m.group(2).upper()}"
+    if _CN_6_RE.fullmatch(s):
+        if s.startswith("6"):
+            return f"{s}.SH"
+        if s.startswith(("0", "3")):
+            return f"{s}.SZ"
+        if s.startswith(("8", "4")):
+            return f"{s}.BJ"
+        return f"{s}.SZ"
+    return s
 
+
+def _normalize_hk(s: str) -> str:
+    if _HK_RE.fullmatch(s):
+        code = s.replace(".HK", "")
+        return f"{code.zfill(5)}.HK"
+    return s
+
+
+# 按市场分发：未列出的市场（US 等）原样返回
+_NORMALIZERS = {"CN": _normalize_cn, "HK": _normalize_hk}
+
+
+# 以下均为 (market, raw) 的纯函数，各入口与检索结果会反复传入相同代码，按参数缓存
+@lru_cache(maxsize=8192)
 def normalize_symbol(market: str, raw: str) -> str:
     market = _normalize_market(market)
     s = (raw or "").strip().upper()
+    fn = _NORMALIZERS.get(market)
+    return fn(s) if fn else s
 
-    if market == "CN":
-        m = _A_CN_SUFFIX_RE.match(s)
-        if m:
-            return f"{m.group(1)}.{m.group(2).upper()}"
-        if re.fullmatch(r"\d{6}", s):
-            if s.startswith("6"):
-                return f"{s}.SH"
-            if s.startswith(("0", "3")):
-                return f"{s}.SZ"
-            if s.startswith(("8", "4")):
-                return f"{s}.BJ"
-            return f"{s}.SZ"
-        return s
 
-    if market == "HK":
-        if re.fullmatch(r"\d{1,5}(\.HK)?", s):
-            code = s.replace(".HK", "")
-            return f"{code.zfill(5)}.HK"
-        return s
+def _is_cn_symbol(s: str) -> bool:
+    return bool(_A_CN_SUFFIX_RE.match(s) or _CN_6_RE.fullmatch(s))
 
-    return s
+
+def _is_hk_symbol(s: str) -> bool:
+    return bool(_HK_RE.fullmatch(s))
 
 
+def _is_us_symbol(s: str) -> bool:
+    return bool(_US_RE.fullmatch(s))
+
+
+_SYMBOL_CHECKS = {"CN": _is_cn_symbol, "HK": _is_hk_symbol}
+
+
+@lru_cache(maxsize=4096)
 def is_explicit_symbol(market: str, raw: str) -> bool:
     market = _normalize_market(market)
     s = (raw or "").strip().upper()
     if not s:
         return False
-
-    if market == "CN":
-        return bool(_A_CN_SUFFIX_RE.match(s) or re.fullmatch(r"\d{6}", s))
-    if market == "HK":
-        return bool(re.fullmatch(r"\d{1,5}(\.HK)?", s))
-    # US
-    return bool(re.fullmatch(r"[A-Z.\-]{1,10}", s))
+    # 其余市场按 US 规则判断
+    return _SYMBOL_CHECKS.get(market, _is_us_symbol)(s)
 
 
+@lru_cache(maxsize=4096)
 def infer_market(raw: str) -> str:
     s = (raw or "").strip().upper()
     if not s:
         return ""
-    if _A_CN_SUFFIX_RE.match(s) or re.fullmatch(r"\d{6}", s):
+    if _is_cn_symbol(s):
         return "CN"
-    if re.fullmatch(r"\d{1,5}(\.HK)?", s):
+    if _is_hk_symbol(s):
         return "HK"
-    if re.fullmatch(r"[A-Z.\-]{1,10}", s):
+    if _is_us_symbol(s):
         return "US"
     return ""
 
@@ -103,66 +143,122 @@ def normalize_symbol_auto(raw: str) -> tuple[str, str] | tuple[None, None]:
     return market, normalize_symbol(market, raw)
 
 
-@st.cache_data(ttl=24 * 3600)
-def _load_cn_universe() -> list[tuple[str, str]]:
-    disable_proxies_for_process()
-    import akshare as ak
-
-    df = ak.stock_zh_a_spot_em()
+def _universe_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """行情表 -> 只含 code/name 两列（字符串、去空白）的代码表，供向量化检索。"""
     code_col = "代码" if "代码" in df.columns else df.columns[0]
     name_col = "名称" if "名称" in df.columns else df.columns[1]
-    return [(str(c).strip(), str(n).strip()) for c, n in zip(df[code_col], df[name_col])]
+    return pd.DataFrame(
+        {
+            "code": [str(c).strip() for c in df[code_col]],
+            "name": [str(n).strip() for n in df[name_col]],
+        }
+    )
 
 
-@st.cache_data(ttl=24 * 3600)
-def _load_hk_universe() -> list[tuple[str, str]]:
+_SPOT_FUNCS = {"CN": "stock_zh_a_spot_em", "HK": "stock_hk_spot_em", "US": "stock_us_spot_em"}
+
+
+def _fetch_universe(market: str) -> pd.DataFrame:
     disable_proxies_for_process()
     import akshare as ak
 
-    df = ak.stock_hk_spot_em()
-    code_col = "代码" if "代码" in df.columns else df.columns[0]
-    name_col = "名称" if "名称" in df.columns else df.columns[1]
-    return [(str(c).strip(), str(n).strip()) for c, n in zip(df[code_col], df[name_col])]
+    return _universe_frame(getattr(ak, _SPOT_FUNCS[market])())
+
+
+def _cached_universe(market: str) -> pd.DataFrame:
+    # 全市场行情接口要分页拉取，很慢：精简后的代码表落盘缓存 1 天，进程重启后直接读本地文件
+    return cached(_fetch_universe, ttl_days=1.0)(market=market)
 
 
 @st.cache_data(ttl=24 * 3600)
-def _load_us_universe() -> list[tuple[str, str]]:
-    disable_proxies_for_process()
-    import akshare as ak
+def _load_cn_universe() -> pd.DataFrame:
+    return _cached_universe("CN")
 
-    df = ak.stock_us_spot_em()
-    code_col = "代码" if "代码" in df.columns else df.columns[0]
-    name_col = "名称" if "名称" in df.columns else df.columns[1]
-    return [(str(c).strip(), str(n).strip()) for c, n in zip(df[code_col], df[name_col])]
 
+@st.cache_data(ttl=24 * 3600)
+def _load_hk_universe() -> pd.DataFrame:
+    return _cached_universe("HK")
 
-def fuzzy_search(market: str, query: str, limit: int = 20) -> list[StockCandidate]:
-    market = _normalize_market(market)
-    q = (query or "").strip()
-    if not q:
-        return []
 
-    q_upper = q.upper()
+@st.cache_data(ttl=24 * 3600)
+def _load_us_universe() -> pd.DataFrame:
+    return _cached_universe("US")
+
+
+@dataclass(frozen=True)
+class _SubstringIndex:
+    """把一列字符串用换行拼成一个大串：子串查找交给 str.find（C 实现），命中位置经 bisect 换回行号。"""
+
+    haystack: str
+    starts: list[int]
+
+    @classmethod
+    def build(cls, keys: list[str]) -> "_SubstringIndex":
+        starts = []
+        pos = 0
+        for k in keys:
+            starts.append(pos)
+            pos += len(k) + 1
+        return cls(haystack="\n".join(keys), starts=starts)
+
+    def find_rows(self, q: str, limit: int) -> list[int]:
+        # 按行序返回前 limit 个包含 q 的行号；同一行多次命中只记一次
+        rows: list[int] = []
+        pos = self.haystack.find(q)
+        while pos != -1 and len(rows) < limit:
+            i = bisect_right(self.starts, pos) - 1
+            rows.append(i)
+            if i + 1 >= len(self.starts):
+                break
+            pos = self.haystack.find(q, self.starts[i + 1])
+        return rows
+
+
+@dataclass(frozen=True)
+class _UniverseIndex:
+    codes: list[str]
+    names: list[str]
+    code_index: _SubstringIndex
+    name_index: _SubstringIndex
+    fold_code_case: bool = False
+
 
+@st.cache_resource(ttl=24 * 3600)
+def _universe_index(market: str) -> _UniverseIndex:
+    # 代码表按市场建一次检索索引，逐键输入时每次查询不再扫描整张表
     if market == "CN":
         universe = _load_cn_universe()
-        matches = []
-        for code, name in universe:
-            if q in code or q in name:
-                matches.append(StockCandidate(market="CN", symbol=normalize_symbol("CN", code), name=name))
-        return matches[:limit]
-
-    if market == "HK":
+    elif market == "HK":
         universe = _load_hk_universe()
-        matches = []
-        for code, name in universe:
-            if q in code or q in name:
-                matches.append(StockCandidate(market="HK", symbol=normalize_symbol("HK", code), name=name))
-        return matches[:limit]
-
-    universe = _load_us_universe()
-    matches = []
-    for code, name in universe:
-        if q_upper in code.upper() or q in name:
-            matches.append(StockCandidate(market="US", symbol=normalize_symbol("US", code), name=name))
-    return matches[:limit]
+    else:
+        universe = _load_us_universe()
+    codes = universe["code"].tolist()
+    names = universe["name"].tolist()
+    # 美股代码不区分大小写
+    fold = market == "US"
+    return _UniverseIndex(
+        codes=codes,
+        names=names,
+        code_index=_SubstringIndex.build([c.upper() for c in codes] if fold else codes),
+        name_index=_SubstringIndex.build(names),
+        fold_code_case=fold,
+    )
+
+
+def fuzzy_search(market: str, query: str, limit: int = 20) -> list[StockCandidate]:
+    market = _normalize_market(market)
+    q = (query or "").strip()
+    # 索引用换行分隔各行，含换行的查询不可能命中单行
+    if not q or limit <= 0 or "\n" in q:
+        return []
+    if market not in {"CN", "HK"}:
+        market = "US"
+
+    idx = _universe_index(market)
+    # 代码命中与名称命中各取前 limit 个，合并后按原表顺序截断，与逐行扫描的结果一致
+    code_rows = idx.code_index.find_rows(q.upper() if idx.fold_code_case else q, limit)
+    name_rows = idx.name_index.find_rows(q, limit)
+    rows = sorted(set(code_rows) | set(name_rows))[:limit]
+    return [
+        StockCandidate(market=market, symbol=normalize_symbol(market, idx.codes[i]), name=idx.names[i]) for i in rows
+    ]
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import re
+from functools import lru_cache
+
 GLOBAL_CSS = """
 <style>
-@import url('https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;600;700&family=Inter:wght@300;400;500;600&display=swap');
-
 /* ========== Apple 深色简约高级风格 ========== */
 
 /* CSS 变量 - 设计令牌 */
@@ -652,6 +653,11 @@ hr {
     border-radius: var(--radius-md) !important;
 }
 
+/* 移动端固定顶部导航栏：默认隐藏，窄屏下在下方媒体查询中显示 */
+.mobile-nav-bar {
+    display: none;
+}
+
 /* ========== 移动端适配 ========== */
 @media (max-width: 768px) {
     /* 主内容区 */
@@ -811,32 +817,8 @@ hr {
         font-size: 0.9rem !important;
         margin-bottom: 1.5rem !important;
     }
-}
 
-/* 超小屏幕 */
-@media (max-width: 480px) {
-    .main .block-container {
-        padding: 0.75rem !important;
-        padding-top: 4rem !important;
-    }
-
-    /* 超小屏再加大按钮，提升可点性 */
-    .stButton > button {
-        min-height: 48px !important;
-        font-size: 1rem !important;
-    }
-    
-    .stat-value {
-        font-size: 1.25rem !important;
-    }
-    
-    .metric-value {
-        font-size: 1.25rem !important;
-    }
-}
-
-/* ========== 移动端整体优化 ========== */
-@media (max-width: 768px) {
+    /* ========== 移动端整体优化 ========== */
     /* 隐藏 Streamlit 默认 header/footer/menu */
     header[data-testid="stHeader"],
     footer,
@@ -970,14 +952,8 @@ hr {
         overflow-x: auto !important;
         white-space: pre !important;
     }
-}
-
-/* ========== 移动端固定顶部导航栏 ========== */
-.mobile-nav-bar {
-    display: none;
-}
 
-@media (max-width: 768px) {
+    /* ========== 移动端固定顶部导航栏 ========== */
     .mobile-nav-bar {
         display: flex !important;
         position: fixed;
@@ -1062,13 +1038,162 @@ hr {
         display: none !important;
     }
 }
+
+/* 超小屏幕（放在 768px 规则之后；上下内边距沿用上面为固定导航栏预留的值） */
+@media (max-width: 480px) {
+    .main .block-container {
+        padding-left: 0.75rem !important;
+        padding-right: 0.75rem !important;
+    }
+
+    /* 超小屏再加大按钮，提升可点性 */
+    .stButton > button {
+        min-height: 48px !important;
+        font-size: 1rem !important;
+    }
+    
+    .stat-value {
+        font-size: 1.25rem !important;
+    }
+    
+    .metric-value {
+        font-size: 1.25rem !important;
+    }
+}
 </style>
 """
 
 
+# 字体样式表用 <link> 单独引入，不在 <style> 里 @import：后者要等 Google 返回才能生效，拖慢首屏样式。
+# 加载期间由 --font-body 里的系统字体兜底（URL 带 display=swap）
+_FONT_CSS_URL = "https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;600;700&display=swap"
+_FONT_LINKS = (
+    '<link rel="preconnect" href="https://fonts.googleapis.com">'
+    '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'
+    f'<link rel="stylesheet" href="{_FONT_CSS_URL}">'
+)
+
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_WS_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON_RE = re.compile(r":\s+")
+_CSS_ROOT_RE = re.compile(r":root\s*\{(.*?)\}", re.S)
+_CSS_VAR_DEF_RE = re.compile(r"(--[\w-]+)\s*:\s*([^;]+);")
+_CSS_VAR_USE_RE = re.compile(r"var\((--[\w-]+)\)")
+
+
+def _inline_css_vars(css: str) -> str:
+    """把 :root 里定义的设计令牌直接代入 var(--x) 引用处（运行时不会改变）。
+
+    :root 定义本身保留：render_mobile_nav 等单独注入的样式仍通过 var() 引用这些令牌。
+    """
+    m = _CSS_ROOT_RE.search(_CSS_COMMENT_RE.sub("", css))
+    if not m:
+        return css
+    tokens = {name: value.strip() for name, value in _CSS_VAR_DEF_RE.findall(m.group(1))}
+    return _CSS_VAR_USE_RE.sub(lambda v: tokens.get(v.group(1), v.group(0)), css)
+
+
+def _minify_css(css: str) -> str:
+    """去注释、压缩空白、去掉 {};,> 两侧与冒号后的空格；冒号前的空格在选择器里有含义，保留"""
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_WS_RE.sub(" ", css)
+    css = _CSS_PUNCT_RE.sub(r"\1", css)
+    css = _CSS_COLON_RE.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=1)
+def _css_payload() -> str:
+    """注入用的字体链接 + 样式字符串（已压缩），进程内只准备一次"""
+    return _FONT_LINKS + _minify_css(_inline_css_vars(GLOBAL_CSS))
+
+
+# 移动端底部导航样式：内容固定，导入时压缩一次，render_mobile_nav 每次渲染直接复用
+_MOBILE_NAV_CSS = _minify_css("""
+<style>
+/* 默认隐藏，仅窄屏下由下面的媒体查询改为 flex */
+.mobile-bottom-nav,
+.mobile-nav-buttons {
+    display: none;
+}
+@media (max-width: 768px) {
+    /* 底部导航栏容器 */
+    .mobile-bottom-nav {
+        position: fixed;
+        bottom: 0;
+        left: 0;
+        right: 0;
+        background: var(--bg-surface);
+        border-top: 1px solid var(--border-color);
+        padding: 0.5rem 0;
+        padding-bottom: calc(0.5rem + env(safe-area-inset-bottom));
+        z-index: 999998;
+        display: flex;
+        justify-content: space-around;
+        align-items: center;
+    }
+    .mobile-bottom-nav .nav-item {
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        gap: 0.25rem;
+        padding: 0.5rem 1rem;
+        color: var(--text-secondary);
+        text-decoration: none;
+        font-size: 0.7rem;
+        border-radius: var(--radius-sm);
+        transition: all 0.2s;
+        min-width: 60px;
+    }
+    .mobile-bottom-nav .nav-item:active {
+        background: var(--bg-elevated);
+    }
+    .mobile-bottom-nav .nav-item .nav-icon {
+        font-size: 1.25rem;
+    }
+    
+    /* 底部导航按钮区域 */
+    .mobile-nav-buttons {
+        position: fixed;
+        bottom: calc(env(safe-area-inset-bottom) + 0.5rem);
+        left: 0;
+        right: 0;
+        padding: 0 1rem;
+        z-index: 999999;
+        display: flex;
+        justify-content: center;
+        gap: 1rem;
+        pointer-events: none;
+    }
+    .mobile-nav-buttons > div {
+        pointer-events: auto;
+    }
+    .mobile-nav-buttons .stButton > button {
+        min-width: 70px !important;
+        min-height: 44px !important;
+        border-radius: 22px !important;
+        font-size: 0.85rem !important;
+        padding: 0.5rem 1rem !important;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.3) !important;
+        background: var(--bg-surface) !important;
+        color: var(--text-primary) !important;
+        border: 1px solid var(--border-color) !important;
+    }
+    .mobile-nav-buttons .stButton > button:active {
+        background: var(--bg-elevated) !important;
+        transform: scale(0.98);
+    }
+}
+</style>
+""")
+
+
 def inject_css():
+    # 每次 rerun 都要重新输出：Streamlit 会清掉本轮未再渲染的元素，只注入一次样式会在下一次交互后丢失
     import streamlit as st
-    st.markdown(GLOBAL_CSS, unsafe_allow_html=True)
+    st.markdown(_css_payload(), unsafe_allow_html=True)
 
 
 def render_sidebar():
@@ -1101,84 +1226,7 @@ def render_mobile_nav(title: str = "财务分析专家", show_back: bool = True,
     ''', unsafe_allow_html=True)
     
     # 底部固定导航栏样式
-    st.markdown('''
-    <style>
-    @media (max-width: 768px) {
-        /* 底部导航栏容器 */
-        .mobile-bottom-nav {
-            position: fixed;
-            bottom: 0;
-            left: 0;
-            right: 0;
-            background: var(--bg-surface);
-            border-top: 1px solid var(--border-color);
-            padding: 0.5rem 0;
-            padding-bottom: calc(0.5rem + env(safe-area-inset-bottom));
-            z-index: 999998;
-            display: flex;
-            justify-content: space-around;
-            align-items: center;
-        }
-        .mobile-bottom-nav .nav-item {
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            gap: 0.25rem;
-            padding: 0.5rem 1rem;
-            color: var(--text-secondary);
-            text-decoration: none;
-            font-size: 0.7rem;
-            border-radius: var(--radius-sm);
-            transition: all 0.2s;
-            min-width: 60px;
-        }
-        .mobile-bottom-nav .nav-item:active {
-            background: var(--bg-elevated);
-        }
-        .mobile-bottom-nav .nav-item .nav-icon {
-            font-size: 1.25rem;
-        }
-        
-        /* 底部导航按钮区域 */
-        .mobile-nav-buttons {
-            position: fixed;
-            bottom: calc(env(safe-area-inset-bottom) + 0.5rem);
-            left: 0;
-            right: 0;
-            padding: 0 1rem;
-            z-index: 999999;
-            display: flex;
-            justify-content: center;
-            gap: 1rem;
-            pointer-events: none;
-        }
-        .mobile-nav-buttons > div {
-            pointer-events: auto;
-        }
-        .mobile-nav-buttons .stButton > button {
-            min-width: 70px !important;
-            min-height: 44px !important;
-            border-radius: 22px !important;
-            font-size: 0.85rem !important;
-            padding: 0.5rem 1rem !important;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.3) !important;
-            background: var(--bg-surface) !important;
-            color: var(--text-primary) !important;
-            border: 1px solid var(--border-color) !important;
-        }
-        .mobile-nav-buttons .stButton > button:active {
-            background: var(--bg-elevated) !important;
-            transform: scale(0.98);
-        }
-    }
-    @media (min-width: 769px) {
-        .mobile-bottom-nav,
-        .mobile-nav-buttons {
-            display: none !important;
-        }
-    }
-    </style>
-    ''', unsafe_allow_html=True)
+    st.markdown(_MOBILE_NAV_CSS, unsafe_allow_html=True)
     
     # 简化的底部导航按钮（使用 Streamlit 原生按钮，放在页面底部）
     st.markdown('<div class="mobile-nav-buttons">', unsafe_allow_html=True)
@@ -1706,7 +1706,7 @@ def _fetch_and_analyze(symbol: str, market: str, name: str) -> None:
     """获取财务数据并创建分析报告"""
     from core.db import session_scope
     from core.models import Report, ComputedMetric
-    from sqlalchemy import select
+    from sqlalchemy import delete, insert
 
     if st.session_state.get("_fetch_and_analyze_running"):
         st.warning("正在获取财务数据，请稍候...")
@@ -1817,30 +1817,36 @@ def _fetch_and_analyze(symbol: str, market: str, name: str) -> None:
             "RECEIVABLE_TURNOVER": "应收账款周转率",
         }
 
+        now = int(time.time())
+        calc_trace = f"from {fin_data.source} API"
+        metric_rows = [
+            {
+                "id": f"{report_id}:{code}:{period_end}",
+                "report_id": report_id,
+                "company_id": company_id,
+                "period_end": period_end,
+                "period_type": "annual",
+                "metric_code": code,
+                "metric_name": METRIC_NAMES.get(code, code),
+                "value": value,
+                "unit": "%" if code in ["GROSS_MARGIN", "NET_MARGIN", "ROE", "ROA", "DEBT_ASSET"] else "",
+                "calc_trace": calc_trace,
+                "created_at": now,
+            }
+            for code, value in metrics.items()
+            if value is not None
+        ]
+
         with session_scope() as s:
             r = s.get(Report, report_id)
             if r:
                 r.status = "done"
-                r.updated_at = int(time.time())
-
-            for old in s.execute(select(ComputedMetric).where(ComputedMetric.report_id == report_id)).scalars().all():
-                s.delete(old)
-
-            for code, value in metrics.items():
-                if value is not None:
-                    m = ComputedMetric(
-                        id=f"{report_id}:{code}:{period_end}",
-                        report_id=report_id,
-                        company_id=company_id,
-                        period_end=period_end,
-                        period_type="annual",
-                        metric_code=code,
-                        metric_name=METRIC_NAMES.get(code, code),
-                        value=value,
-                        unit="%" if code in ["GROSS_MARGIN", "NET_MARGIN", "ROE", "ROA", "DEBT_ASSET"] else "",
-                        calc_trace=f"from {fin_data.source} API",
-                    )
-                    s.add(m)
+                r.updated_at = now
+
+            # 整批删除 + 单条多行 INSERT，避免逐行 ORM add/flush
+            s.execute(delete(ComputedMetric).where(ComputedMetric.report_id == report_id))
+            if metric_rows:
+                s.execute(insert(ComputedMetric), metric_rows)
 
         st.success(f"✅ 成功获取 {len(metrics)} 项财务指标！")
 
@@ -1325,8 +1325,8 @@ def _analyze_pdf_report(report_id: str, pdf_path: str) -> None:
         try:
             meta = _parse_source_meta(r.source_meta)
             meta["extract_diag"] = {
-                "ai_enhanced": bool(getattr(extracted, "_ai_enhanced", False)),
-                "ai_keys": getattr(extracted, "_ai_keys", None),
+                "ai_enhanced": extracted.ai_enhanced,
+                "ai_keys": list(extracted.ai_keys) or None,
                 "report_period": extracted.report_period,
                 "revenue": extracted.revenue,
                 "net_profit": extracted.net_profit,
@@ -0,0 +1,37 @@
+import unittest
+
+from core.pdf_analyzer import (
+    _CURRENT_ASSETS_PATTERNS,
+    _TOTAL_ASSETS_PATTERNS,
+    _AnchorHits,
+    _compile_all,
+    _find_first_number,
+)
+
+
+def _first_number(patterns, text: str, min_value: float = 0):
+    return _find_first_number(patterns, text, _AnchorHits(text), min_value=min_value)
+
+
+class AnchorLookbackTest(unittest.TestCase):
+    """锚点预筛不能丢掉锚点前有长空白的匹配"""
+
+    def test_long_whitespace_before_anchor(self):
+        text = "Total" + " " * 80 + "assets 12,345,678"
+        self.assertEqual(_first_number(_TOTAL_ASSETS_PATTERNS, text, min_value=1000), 12345678)
+
+    def test_long_newlines_before_anchor_dotall(self):
+        text = "Total\n" + "\n" * 70 + "current assets 5,000"
+        self.assertEqual(_first_number(_CURRENT_ASSETS_PATTERNS, text, min_value=100), 5000)
+
+    def test_lookback_bounds(self):
+        rules = _compile_all((
+            ("assets", r"Total\s+assets\s*([0-9,]+)"),
+            ("assets", r"Total\s{1,3}assets\s*([0-9,]+)"),
+            ("营业收入", r"营业收入[：:]\s*([0-9,]+)"),
+        ))
+        self.assertEqual([lookback for _, _, lookback in rules], [None, 8, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()